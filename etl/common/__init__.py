@@ -6,9 +6,12 @@ Shared modules for all ETL jobs:
 - countries: ISO country mapping and normalization
 - scaling: Score normalization functions
 - http: Resilient HTTP client for API calls
+- cache: Parquet cache for parsed raw data files
+- readers: Fast file readers with pandas fallbacks
 """
 
 from common.base import BaseProcessor
+from common.cache import read_cached
 from common.countries import CountryMapper
 from common.http import ResilientHTTPClient
 from common.scaling import (
@@ -24,4 +27,5 @@ __all__ = [
     "CountryMapper",
     "ResilientHTTPClient",
     "BaseProcessor",
+    "read_cached",
 ]
@@ -8,7 +8,7 @@ and loading trust data from external sources.
 import logging
 import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -23,9 +23,14 @@ from common.http import ResilientHTTPClient
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Observation:
-    """A single trust observation to be inserted into the database."""
+    """
+    A single trust observation to be inserted into the database.
+
+    Slotted because jobs create one per country/year/trust type, often
+    thousands per run.
+    """
 
     iso3: str
     year: int
@@ -56,6 +61,29 @@ class Observation:
         )
 
 
+OBSERVATION_COLUMNS: List[str] = [f.name for f in fields(Observation)]
+
+
+def observations_from_frame(df: pd.DataFrame) -> List[Observation]:
+    """
+    Build observations from a frame with one column per Observation field.
+
+    Lets jobs accumulate results column-wise and materialize Observation
+    objects once at the end. Missing columns and NaN values become None.
+
+    Args:
+        df: DataFrame whose columns are named after Observation fields
+
+    Returns:
+        List of Observation objects, one per row
+    """
+    frame = df.reindex(columns=OBSERVATION_COLUMNS)
+    # Integer fields may have been upcast to float by NaNs
+    frame = frame.astype({"year": "Int64", "sample_n": "Int64"}).astype(object)
+    frame = frame.where(frame.notna(), None)
+    return [Observation(*row) for row in frame.itertuples(index=False, name=None)]
+
+
 class BaseProcessor(ABC):
     """Abstract base class for ETL processors."""
 
@@ -63,6 +91,9 @@ class BaseProcessor(ABC):
     SOURCE_NAME: str = "unknown"
     TRUST_TYPE: str = "unknown"
 
+    # Rows per INSERT statement when loading observations
+    DB_PAGE_SIZE: int = 1000
+
     def __init__(self):
         """Initialize the processor with common paths and utilities."""
         self.project_root = Path(__file__).parent.parent.parent
@@ -194,19 +225,7 @@ class BaseProcessor(ABC):
 
         df = pd.DataFrame(
             [obs.to_tuple() for obs in observations],
-            columns=[
-                "iso3",
-                "year",
-                "source",
-                "trust_type",
-                "raw_value",
-                "raw_unit",
-                "score_0_100",
-                "sample_n",
-                "method_notes",
-                "source_url",
-                "methodology",
-            ],
+            columns=OBSERVATION_COLUMNS,
         )
 
         df.to_csv(staging_path, index=False)
@@ -241,7 +260,7 @@ class BaseProcessor(ABC):
 
         try:
             with conn.cursor() as cur:
-                execute_values(
+                returned = execute_values(
                     cur,
                     """INSERT INTO observations
                        (iso3, year, source, trust_type, raw_value, raw_unit,
@@ -255,11 +274,16 @@ class BaseProcessor(ABC):
                          method_notes = EXCLUDED.method_notes,
                          source_url = EXCLUDED.source_url,
                          methodology = EXCLUDED.methodology,
-                         ingested_at = NOW()""",
+                         ingested_at = NOW()
+                       RETURNING 1""",
                     [obs.to_tuple() for obs in observations],
+                    # One multi-row statement per page; the default is 100 rows
+                    page_size=self.DB_PAGE_SIZE,
+                    # cur.rowcount only covers the last page
+                    fetch=True,
                 )
 
-                rows_affected = cur.rowcount
+                rows_affected = len(returned)
                 conn.commit()
                 logger.info(f"Loaded {rows_affected} observations to database")
 
@@ -294,13 +318,15 @@ class BaseProcessor(ABC):
                     logger.info(f"Adding {len(missing)} missing countries: {missing}")
 
                     # Insert with minimal data (can be enriched later)
-                    for iso3 in missing:
-                        cur.execute(
-                            """INSERT INTO countries (iso3, name)
-                               VALUES (%s, %s)
-                               ON CONFLICT (iso3) DO NOTHING""",
-                            (iso3, iso3),  # Use ISO3 as placeholder name
-                        )
+                    execute_values(
+                        cur,
+                        """INSERT INTO countries (iso3, name)
+                           VALUES %s
+                           ON CONFLICT (iso3) DO NOTHING""",
+                        # Use ISO3 as placeholder name
+                        [(iso3, iso3) for iso3 in sorted(missing)],
+                        page_size=self.DB_PAGE_SIZE,
+                    )
 
                     conn.commit()
 
@@ -0,0 +1,226 @@
+"""
+On-disk cache for parsed raw data files.
+
+Survey microdata (Stata, SPSS, CSV) is slow to parse but rarely changes,
+so jobs can keep the parsed frame as a Parquet file next to the source and
+reuse it for as long as the source is unchanged.
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Parquet schema metadata key marking a cache written from an unprojected read
+COMPLETE_KEY = b"etl_cache_complete"
+
+
+def parquet_available() -> bool:
+    """
+    Check whether the optional pyarrow dependency is installed.
+
+    Returns:
+        True if DataFrames can be read from and written to Parquet
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_cache_path(source_path: Path) -> Path:
+    """
+    Get the cache location for a raw data file.
+
+    Args:
+        source_path: Raw file the frame is parsed from
+
+    Returns:
+        Path of the sibling Parquet file (e.g. survey.dta -> survey.dta.parquet)
+    """
+    return source_path.with_name(source_path.name + ".parquet")
+
+
+def load_cached(
+    source_path: Path,
+    columns: Optional[Sequence[str]] = None,
+    cache_path: Optional[Path] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Load a parsed DataFrame from the Parquet cache if it is current.
+
+    The cache is current when it is at least as new as the source file and
+    holds every requested column. A request for all columns is only served
+    by a cache that was written from an unprojected read.
+
+    Args:
+        source_path: Raw file the frame is parsed from
+        columns: Columns needed from the cache (None for all)
+        cache_path: Cache location (defaults to default_cache_path())
+
+    Returns:
+        Cached DataFrame, or None if there is no usable cache
+    """
+    if not parquet_available():
+        return None
+
+    import pyarrow.parquet as pq
+
+    cache_path = cache_path or default_cache_path(source_path)
+
+    if (
+        cache_path.exists()
+        and cache_path.stat().st_mtime >= source_path.stat().st_mtime
+    ):
+        try:
+            schema = pq.read_schema(cache_path)
+            if columns is None:
+                usable = COMPLETE_KEY in (schema.metadata or {})
+            else:
+                usable = set(columns) <= set(schema.names)
+            if usable:
+                logger.debug(f"Using parsed cache {cache_path}")
+                return pd.read_parquet(
+                    cache_path, columns=list(columns) if columns is not None else None
+                )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+
+    return None
+
+
+def write_cache(
+    source_path: Path,
+    df: pd.DataFrame,
+    cache_path: Optional[Path] = None,
+    complete: bool = False,
+) -> None:
+    """
+    Store a parsed DataFrame in the Parquet cache.
+
+    Does nothing without pyarrow. Failures are logged, not raised.
+
+    Args:
+        source_path: Raw file the frame was parsed from
+        df: Parsed DataFrame
+        cache_path: Cache location (defaults to default_cache_path())
+        complete: Whether df holds every column of the source file
+    """
+    if not parquet_available():
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_path = cache_path or default_cache_path(source_path)
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if complete:
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), COMPLETE_KEY: b"1"}
+            )
+        pq.write_table(table, cache_path)
+    except Exception as e:
+        # Mixed-type object columns cannot always be stored as Parquet
+        logger.warning(f"Could not write cache {cache_path}: {e}")
+        cache_path.unlink(missing_ok=True)
+
+
+def cache_chunks(
+    source_path: Path,
+    chunks: Iterable[pd.DataFrame],
+    cache_path: Optional[Path] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Pass parsed chunks through while appending them to the Parquet cache.
+
+    Chunks go to a temporary file that replaces the cache only after the
+    last chunk, so an interrupted read never leaves a partial cache that
+    looks current. If a chunk cannot be stored (e.g. its column types differ
+    from the first chunk's), caching is abandoned and the remaining chunks
+    are still yielded. Without pyarrow the chunks are yielded unchanged.
+    The cache is not marked complete, so it only serves requests for named
+    columns.
+
+    Args:
+        source_path: Raw file the chunks are parsed from
+        chunks: Parsed chunks of the source file
+        cache_path: Cache location (defaults to default_cache_path())
+
+    Yields:
+        The given chunks
+    """
+    if not parquet_available():
+        yield from chunks
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_path = cache_path or default_cache_path(source_path)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    writer = None
+    caching = True
+
+    try:
+        for chunk in chunks:
+            if caching:
+                try:
+                    table = pa.Table.from_pandas(
+                        chunk,
+                        schema=writer.schema if writer is not None else None,
+                        preserve_index=False,
+                    )
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, table.schema)
+                    writer.write_table(table)
+                except Exception as e:
+                    logger.warning(f"Could not write cache {cache_path}: {e}")
+                    caching = False
+            yield chunk
+
+        if writer is not None and caching:
+            writer.close()
+            writer = None
+            tmp_path.replace(cache_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_cached(
+    source_path: Path,
+    loader: Callable[[], pd.DataFrame],
+    columns: Optional[Sequence[str]] = None,
+    cache_path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Load a parsed DataFrame, reusing a Parquet cache when it is current.
+
+    The cache is used when it is at least as new as the source file and
+    holds every requested column. Otherwise loader() parses the source and
+    the result is written to the cache, marked as complete only when no
+    columns were requested. Without pyarrow this just calls loader().
+
+    Args:
+        source_path: Raw file the frame is parsed from
+        loader: Callable that parses the source file
+        columns: Columns needed from the cache (None for all)
+        cache_path: Cache location (defaults to default_cache_path())
+
+    Returns:
+        Parsed DataFrame
+    """
+    df = load_cached(source_path, columns=columns, cache_path=cache_path)
+    if df is not None:
+        return df
+
+    df = loader()
+    write_cache(source_path, df, cache_path=cache_path, complete=columns is None)
+    return df
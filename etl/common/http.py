@@ -115,7 +115,13 @@ class ResilientHTTPClient:
             Parsed JSON response
         """
         response = self._make_request("GET", url, params=params)
-        result: dict[Any, Any] | list[Any] = response.json()
+        try:
+            # Optional faster parser for large payloads (e.g. Eurostat JSON-stat)
+            import orjson
+        except ImportError:
+            result: dict[Any, Any] | list[Any] = response.json()
+        else:
+            result = orjson.loads(response.content)
         return result
 
     def get_csv(
@@ -0,0 +1,88 @@
+"""
+Fast readers for raw data files.
+
+Wrap the optional pyarrow and calamine parsers with a pandas fallback so
+jobs can read large inputs quickly when they are installed and still run
+without them.
+"""
+
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import pandas as pd
+
+
+def read_csv(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV file, using pyarrow's multithreaded parser when installed.
+
+    Args:
+        path: CSV file to read
+        columns: Columns to keep (None for all); names missing from the
+            file are ignored, as with a callable pandas usecols
+
+    Returns:
+        DataFrame with numpy-backed dtypes
+    """
+    wanted = set(columns) if columns is not None else None
+
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        usecols = (lambda c: c in wanted) if wanted is not None else None
+        return pd.read_csv(path, usecols=usecols)
+
+    include = None
+    if wanted is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        include = [c for c in header if c in wanted]
+        if not include:
+            # pyarrow treats an empty include list as "all columns"
+            return pd.read_csv(path, usecols=lambda c: False)
+
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            include_columns=include,
+            # Match pandas: empty strings are missing values
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+
+def read_excel(
+    path: Path,
+    sheet_name: Union[str, int] = 0,
+    header: int = 0,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read an Excel sheet, using the calamine engine when installed.
+
+    python-calamine parses .xlsx files several times faster than the
+    default pure-Python openpyxl engine.
+
+    Args:
+        path: Workbook to read
+        sheet_name: Sheet name or index
+        header: Row number holding the column names
+        columns: Columns to keep (None for all); names missing from the
+            sheet are ignored
+
+    Returns:
+        DataFrame of the sheet
+    """
+    wanted = set(columns) if columns is not None else None
+    usecols = (lambda c: c in wanted) if wanted is not None else None
+
+    try:
+        import python_calamine  # noqa: F401
+
+        engine: Optional[str] = "calamine"
+    except ImportError:
+        engine = None
+
+    return pd.read_excel(
+        path, sheet_name=sheet_name, header=header, usecols=usecols, engine=engine
+    )
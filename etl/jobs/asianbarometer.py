@@ -29,7 +29,12 @@ import click
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.base import (
+    OBSERVATION_COLUMNS,
+    BaseProcessor,
+    Observation,
+    observations_from_frame,
+)
 
 # Asian Barometer country codes to ISO3 (verified from Wave 5 data)
 ASIAN_COUNTRY_CODES = {
@@ -79,6 +84,25 @@ ASIAN_COUNTRY_CODES = {
     "East Timor": "TLS",
 }
 
+# Lookup tables split by key type, built once at import. Name keys are
+# case-folded so spellings like "VIET NAM" still match.
+_ASIAN_CODES_BY_INT = {
+    k: v for k, v in ASIAN_COUNTRY_CODES.items() if isinstance(k, int)
+}
+_ASIAN_CODES_BY_NAME = {
+    k.casefold(): v for k, v in ASIAN_COUNTRY_CODES.items() if isinstance(k, str)
+}
+
+
+def _count_by_group(codes, masks, n_groups: int):
+    """Count True values in each column of a boolean matrix per group code."""
+    import numpy as np
+
+    counts = np.zeros((n_groups, masks.shape[1]), dtype=np.int64)
+    for i in range(masks.shape[1]):
+        counts[:, i] = np.bincount(codes, weights=masks[:, i], minlength=n_groups)
+    return counts
+
 
 class AsianBarometerProcessor(BaseProcessor):
     """Processor for Asian Barometer survey data."""
@@ -170,9 +194,16 @@ class AsianBarometerProcessor(BaseProcessor):
 
     def process(self, data_path: Path, year: int) -> List[Observation]:
         """Process Asian Barometer data to observations."""
+        import numpy as np
+        import pandas as pd
         import pyreadstat
 
-        observations = []
+        # Accumulate results column-wise; Observations are built once at the end
+        columns: dict[str, list] = {name: [] for name in OBSERVATION_COLUMNS}
+
+        def emit(**fields) -> None:
+            for name, values in columns.items():
+                values.append(fields.get(name))
 
         # Detect wave from filename/path
         path_str = str(data_path).upper()
@@ -224,90 +255,112 @@ class AsianBarometerProcessor(BaseProcessor):
                         col_map[key] = col
                         break
 
-        # Get unique countries
-        countries = df[country_col].dropna().unique()
+        # Per-column bounds so each country's responses are reduced in one
+        # pass: valid answers fall in [1, upper] and trust answers fall in
+        # [trust_lo, trust_hi]. Interpersonal is 1-2 with a single trust code
+        # (varies by wave); institutional items count codes <= trust_max.
+        interp_col = col_map.get("interpersonal")
+        trust_code = vars_config.get("interpersonal_trust_code", 1)
+        inst_scale = vars_config.get("institutional_scale", 4)
+        trust_max = vars_config.get(
+            "institutional_trust_max", 2
+        )  # Max value considered "trust"
+        inst_cols = [
+            col
+            for col in (
+                col_map.get("institutional_exec"),
+                col_map.get("institutional_natgov"),
+            )
+            if col
+        ]
+        stat_cols = ([interp_col] if interp_col else []) + inst_cols
+        n_interp = len(stat_cols) - len(inst_cols)
+        upper = np.array(
+            [2] * n_interp + [inst_scale] * len(inst_cols), dtype=np.float32
+        )
+        trust_lo = np.array(
+            [trust_code] * n_interp + [1] * len(inst_cols), dtype=np.float32
+        )
+        trust_hi = np.array(
+            [trust_code] * n_interp + [trust_max] * len(inst_cols), dtype=np.float32
+        )
 
-        for country_val in countries:
+        # Count valid and trust answers for every country in one pass over
+        # the file: factorize the country column, then bincount the masks.
+        # NaN compares False, so missing answers drop out of both masks.
+        codes, countries = pd.factorize(df[country_col])
+        n_countries = len(countries)
+        mat = df[stat_cols].to_numpy(dtype=np.float32)
+        valid = (mat >= 1) & (mat <= upper)
+        trusting = valid & (mat >= trust_lo) & (mat <= trust_hi)
+        has_country = codes >= 0
+        codes = codes[has_country]
+        sizes = np.bincount(codes, minlength=n_countries)
+        valid_counts = _count_by_group(codes, valid[has_country], n_countries)
+        trust_totals = _count_by_group(codes, trusting[has_country], n_countries)
+
+        for idx, country_val in enumerate(countries):
             # Get ISO3 code
             if isinstance(country_val, (int, float)):
-                iso3 = ASIAN_COUNTRY_CODES.get(int(country_val))
+                iso3 = _ASIAN_CODES_BY_INT.get(int(country_val))
             else:
-                iso3 = ASIAN_COUNTRY_CODES.get(str(country_val))
+                iso3 = _ASIAN_CODES_BY_NAME.get(str(country_val).strip().casefold())
 
             if not iso3:
                 continue
 
-            country_data = df[df[country_col] == country_val]
-            n = len(country_data)
-
-            if n < self.MIN_SAMPLE_SIZE:
+            if sizes[idx] < self.MIN_SAMPLE_SIZE:
                 continue
 
+            counts = valid_counts[idx]
+            trust_counts = trust_totals[idx]
+
             # Process interpersonal trust (1-2 scale, trust code varies by wave)
-            interp_col = col_map.get("interpersonal")
-            trust_code = vars_config.get("interpersonal_trust_code", 1)
-            if interp_col and interp_col in df.columns:
-                interp_data = country_data[interp_col].dropna()
-                # Filter valid responses (1-2 only)
-                interp_valid = interp_data[(interp_data >= 1) & (interp_data <= 2)]
-                if len(interp_valid) >= self.MIN_SAMPLE_SIZE:
+            if n_interp:
+                interp_n = int(counts[0])
+                if interp_n >= self.MIN_SAMPLE_SIZE:
                     # Calculate % who trust (code varies by wave)
-                    trust_pct = float((interp_valid == trust_code).mean() * 100)
+                    trust_pct = float(trust_counts[0] / interp_n * 100)
                     var_name = vars_config.get("interpersonal", "q22")
-                    observations.append(
-                        Observation(
-                            iso3=iso3,
-                            year=int(data_year),
-                            source=self.SOURCE_NAME,
-                            trust_type="interpersonal",
-                            raw_value=round(trust_pct, 1),
-                            raw_unit="% most people can be trusted",
-                            score_0_100=round(trust_pct, 1),
-                            sample_n=int(len(interp_valid)),
-                            method_notes=f"Asian Barometer Wave {wave_num} {var_name}, n={len(interp_valid)}",
-                            source_url="https://www.asianbarometer.org",
-                            methodology="4point",
-                        )
+                    emit(
+                        iso3=iso3,
+                        year=int(data_year),
+                        source=self.SOURCE_NAME,
+                        trust_type="interpersonal",
+                        raw_value=round(trust_pct, 1),
+                        raw_unit="% most people can be trusted",
+                        score_0_100=round(trust_pct, 1),
+                        sample_n=interp_n,
+                        method_notes=f"Asian Barometer Wave {wave_num} {var_name}, n={interp_n}",
+                        source_url="https://www.asianbarometer.org",
+                        methodology="4point",
                     )
 
             # Process institutional trust (average of exec + national govt)
-            exec_col = col_map.get("institutional_exec")
-            natgov_col = col_map.get("institutional_natgov")
-
             inst_scores = []
             inst_n = 0
-            inst_scale = vars_config.get("institutional_scale", 4)
-            trust_max = vars_config.get(
-                "institutional_trust_max", 2
-            )  # Max value considered "trust"
-            for col in [exec_col, natgov_col]:
-                if col and col in df.columns:
-                    col_data = country_data[col].dropna()
-                    valid = col_data[(col_data >= 1) & (col_data <= inst_scale)]
-                    if len(valid) >= self.MIN_SAMPLE_SIZE:
-                        # Count responses <= trust_max as "trust"
-                        trust_pct = (valid <= trust_max).mean() * 100
-                        inst_scores.append(trust_pct)
-                        inst_n = max(inst_n, len(valid))
+            for i in range(n_interp, len(stat_cols)):
+                if counts[i] >= self.MIN_SAMPLE_SIZE:
+                    # Count responses <= trust_max as "trust"
+                    inst_scores.append(trust_counts[i] / counts[i] * 100)
+                    inst_n = max(inst_n, int(counts[i]))
 
             if inst_scores:
                 avg_inst = float(sum(inst_scores) / len(inst_scores))
-                observations.append(
-                    Observation(
-                        iso3=iso3,
-                        year=int(data_year),
-                        source=self.SOURCE_NAME,
-                        trust_type="institutional",
-                        raw_value=round(avg_inst, 1),
-                        raw_unit="% trust a great deal/quite a lot",
-                        score_0_100=round(avg_inst, 1),
-                        sample_n=int(inst_n),
-                        method_notes=f"Asian Barometer Wave {wave_num} q7/q9 avg, n={inst_n}",
-                        source_url="https://www.asianbarometer.org",
-                    )
+                emit(
+                    iso3=iso3,
+                    year=int(data_year),
+                    source=self.SOURCE_NAME,
+                    trust_type="institutional",
+                    raw_value=round(avg_inst, 1),
+                    raw_unit="% trust a great deal/quite a lot",
+                    score_0_100=round(avg_inst, 1),
+                    sample_n=int(inst_n),
+                    method_notes=f"Asian Barometer Wave {wave_num} q7/q9 avg, n={inst_n}",
+                    source_url="https://www.asianbarometer.org",
                 )
 
-        return observations
+        return observations_from_frame(pd.DataFrame(columns))
 
 
 @click.command()
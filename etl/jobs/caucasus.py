@@ -44,6 +44,21 @@ INST_TRUST_MAP = {
 }
 
 
+def to_numeric_responses(values: pd.Series) -> np.ndarray:
+    """Convert survey responses to floats, mapping non-numeric labels to NaN.
+
+    Labelled Stata columns arrive as categoricals; decode the (small) category
+    index once and take by code instead of stringifying every response.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = pd.to_numeric(
+            values.cat.categories.astype(str), errors="coerce"
+        ).to_numpy(dtype=float)
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, categories[codes], np.nan)
+    return np.asarray(pd.to_numeric(values, errors="coerce"), dtype=float)
+
+
 def scale_1_10_to_100(value):
     """Convert 1-10 trust scale to 0-100."""
     return (value - 1) / 9 * 100
@@ -91,22 +106,29 @@ class CaucasusBarometerProcessor(BaseProcessor):
         # Key institutional trust columns
         inst_cols = ["TRUEXEC", "TRUPARL", "TRUCRTS"]  # Executive, Parliament, Courts
 
-        for country_name, iso3 in CB_COUNTRY_MAP.items():
-            country_df = df[df[country_col] == country_name]
-            if len(country_df) == 0:
-                continue
-
+        # Drop unmapped countries up front and decode the trust columns once,
+        # so each per-country slice is a small block of float32 values.
+        # Non-numeric labels like "Don't know" become NaN.
+        df = df[df[country_col].isin(CB_COUNTRY_MAP.keys())].reset_index(drop=True)
+        if interpersonal_col in df.columns:
+            df[interpersonal_col] = to_numeric_responses(df[interpersonal_col]).astype(
+                np.float32
+            )
+        for col in inst_cols:
+            if col in df.columns:
+                df[col] = df[col].map(INST_TRUST_MAP).astype(np.float32)
+
+        for country_name, country_df in df.groupby(
+            country_col, sort=False, observed=True
+        ):
+            iso3 = CB_COUNTRY_MAP[country_name]
             sample_n = len(country_df)
 
             # Interpersonal trust (GALLTRU)
             if interpersonal_col in df.columns:
-                trust_values = country_df[interpersonal_col]
-                # Convert categorical to numeric (filter out non-numeric like "Don't know")
-                numeric_values = pd.to_numeric(
-                    trust_values.astype(str), errors="coerce"
-                )
-                valid_trust = numeric_values.dropna()
-                valid_trust = valid_trust[(valid_trust >= 1) & (valid_trust <= 10)]
+                # NaN compares False, so the range mask also drops missing values
+                trust_values = country_df[interpersonal_col].to_numpy()
+                valid_trust = trust_values[(trust_values >= 1) & (trust_values <= 10)]
 
                 if len(valid_trust) >= 50:
                     mean_trust = float(valid_trust.mean())
@@ -132,8 +154,7 @@ class CaucasusBarometerProcessor(BaseProcessor):
             inst_values = []
             for col in inst_cols:
                 if col in df.columns:
-                    col_vals = country_df[col].map(INST_TRUST_MAP)
-                    valid = col_vals.dropna()
+                    valid = country_df[col].dropna()
                     if len(valid) >= 50:
                         inst_values.append(float(valid.mean()))
 
@@ -18,12 +18,15 @@ Data sources:
 - 2021: https://dataverse.harvard.edu/dataset.xhtml?persistentId=doi:10.7910/DVN/XBZHKC
 """
 
+import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import click
+import numpy as np
 import pandas as pd
 
 # Add project root to path
@@ -31,6 +34,77 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from common.base import BaseProcessor, Observation
+from common.cache import read_cached
+from common.readers import read_csv
+
+
+def _response_values(responses: pd.Series) -> np.ndarray:
+    """
+    Get a survey column as a numpy array without copying numeric data.
+
+    Integer and float columns are returned as views; the kernels below rely
+    on NaN comparing unequal, so nothing needs to be dropped first. Other
+    dtypes (e.g. nullable integers) are converted to float64 with NaN.
+    """
+    values: np.ndarray = responses.to_numpy(copy=False)
+    if values.dtype.kind not in "iuf":
+        values = responses.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values
+
+
+def _binary_counts(
+    values: np.ndarray, trust_val: float, careful_val: float
+) -> Tuple[int, int]:
+    """
+    Count answers to a "can trust" / "can't be too careful" question.
+
+    NaN matches neither code, so missing answers drop out without a
+    separate filtering pass.
+
+    Returns:
+        Tuple of (valid answers, trusting answers)
+    """
+    n_trust = int(np.count_nonzero(values == trust_val))
+    return n_trust + int(np.count_nonzero(values == careful_val)), n_trust
+
+
+def _range_mean(
+    values: np.ndarray, min_val: float, max_val: float
+) -> Tuple[int, float]:
+    """
+    Count and average the answers within [min_val, max_val].
+
+    NaN fails both comparisons, so missing answers are excluded.
+
+    Returns:
+        Tuple of (valid answers, mean of valid answers or NaN if none)
+    """
+    valid = values[(values >= min_val) & (values <= max_val)]
+    return len(valid), float(valid.mean()) if len(valid) else float("nan")
+
+
+class InterpersonalConfig(NamedTuple):
+    """CES "can trust" / "can't be too careful" question for one wave."""
+
+    column: str
+    trust_value: int  # Code meaning "can trust"
+    careful_value: int  # Code meaning "can't be too careful"
+    scale_type: str = "binary"
+
+
+class InstitutionalConfig(NamedTuple):
+    """CES federal government satisfaction question for one wave."""
+
+    column: str
+    scale_type: str  # "likert_5" (1-5) or "likert_7" (1-7)
+    valid_range: Tuple[int, int]  # (min, max) valid codes
+
+
+class WaveMapping(NamedTuple):
+    """Trust questions asked in one CES wave."""
+
+    interpersonal: Optional[InterpersonalConfig] = None
+    institutional: Optional[InstitutionalConfig] = None
 
 
 class CESProcessor(BaseProcessor):
@@ -38,6 +112,7 @@ class CESProcessor(BaseProcessor):
 
     SOURCE_NAME = "CES"
     MIN_SAMPLE_SIZE = 300
+    STATA_CHUNK_SIZE = 50_000  # Rows per chunk when streaming Stata files via pandas
 
     # File patterns for each wave
     WAVE_FILES = {
@@ -48,57 +123,41 @@ class CESProcessor(BaseProcessor):
     }
 
     # Variable mappings per CES wave
-    # Each mapping includes: column name, trust_value (which value means "trust"),
-    # careful_value (which value means "careful"), and scale_type
-    WAVE_MAPPINGS: dict[int, dict[str, Any]] = {
-        2008: {
-            "interpersonal": {
-                "column": "ces08_PES_TRUST_1",
-                "trust_value": 1,
-                "careful_value": 5,
-                "scale_type": "binary",
-            },
+    WAVE_MAPPINGS: Dict[int, WaveMapping] = {
+        2008: WaveMapping(
+            interpersonal=InterpersonalConfig(
+                column="ces08_PES_TRUST_1", trust_value=1, careful_value=5
+            ),
             # No institutional trust in 2008 cumulative file
-        },
-        2015: {
-            "interpersonal": {
-                "column": "p_trust",
-                "trust_value": 1,
-                "careful_value": 5,
-                "scale_type": "binary",
-            },
-            "institutional": {
-                "column": "sat_govt",
-                "scale_type": "likert_7",  # 1=very dissatisfied, 7=very satisfied
-                "valid_range": (1, 7),
-            },
-        },
-        2019: {
-            "interpersonal": {
-                "column": "pes19_trust",
-                "trust_value": 1,
-                "careful_value": 2,
-                "scale_type": "binary",
-            },
-            "institutional": {
-                "column": "cps19_fed_gov_sat",
-                "scale_type": "likert_5",
-                "valid_range": (1, 5),
-            },
-        },
-        2021: {
-            "interpersonal": {
-                "column": "pes21_trust",
-                "trust_value": 1,
-                "careful_value": 2,
-                "scale_type": "binary",  # 3=depends is excluded
-            },
-            "institutional": {
-                "column": "cps21_fed_gov_sat",
-                "scale_type": "likert_5",
-                "valid_range": (1, 5),
-            },
-        },
+        ),
+        2015: WaveMapping(
+            interpersonal=InterpersonalConfig(
+                column="p_trust", trust_value=1, careful_value=5
+            ),
+            institutional=InstitutionalConfig(
+                column="sat_govt",
+                scale_type="likert_7",  # 1=very dissatisfied, 7=very satisfied
+                valid_range=(1, 7),
+            ),
+        ),
+        2019: WaveMapping(
+            interpersonal=InterpersonalConfig(
+                column="pes19_trust", trust_value=1, careful_value=2
+            ),
+            institutional=InstitutionalConfig(
+                column="cps19_fed_gov_sat", scale_type="likert_5", valid_range=(1, 5)
+            ),
+        ),
+        2021: WaveMapping(
+            interpersonal=InterpersonalConfig(
+                column="pes21_trust",
+                trust_value=1,
+                careful_value=2,  # 3=depends is excluded
+            ),
+            institutional=InstitutionalConfig(
+                column="cps21_fed_gov_sat", scale_type="likert_5", valid_range=(1, 5)
+            ),
+        ),
     }
 
     def download(self, year: int) -> Path:
@@ -132,45 +191,54 @@ class CESProcessor(BaseProcessor):
 
     def process(self, input_path: Path, year: int) -> List[Observation]:
         """Process CES survey data into observations."""
+        # Get variable mapping for this wave
+        if year not in self.WAVE_MAPPINGS:
+            raise ValueError(f"No variable mapping for CES {year}")
+
+        mapping = self.WAVE_MAPPINGS[year]
+        needed_cols = [config.column for config in mapping if config is not None]
+
         print(f"Loading CES {year} data from {input_path}...")
 
-        # Handle different file formats
-        if input_path.suffix == ".csv":
-            df = pd.read_csv(input_path)
-        else:
-            try:
-                df = pd.read_stata(
-                    input_path, convert_categoricals=False, convert_dates=False
-                )
-            except UnicodeDecodeError:
-                print(f"  Warning: Encoding issues with {input_path}")
-                raise RuntimeError(
-                    f"CES {year} file has encoding issues. "
-                    "Convert with R: haven::read_dta() then write.csv()"
+        try:
+            # Mapped columns missing from this wave's file are not read (and
+            # so not cached); asking the cache for them would never match
+            needed_cols = self._present_columns(input_path, needed_cols)
+            if needed_cols:
+                # Reuse the parsed columns from a previous run while the file is unchanged
+                df = read_cached(
+                    input_path,
+                    lambda: self._read_columns(input_path, needed_cols),
+                    columns=needed_cols,
                 )
+            else:
+                # Nothing to cache: a Parquet file without columns loses the row count
+                df = self._read_columns(input_path, needed_cols)
+        except UnicodeDecodeError:
+            # Raised by pyreadstat for strings that are not valid UTF-8 (pandas
+            # falls back to latin-1 with a warning instead)
+            print(f"  Warning: Encoding issues with {input_path}")
+            raise RuntimeError(
+                f"CES {year} file has encoding issues. "
+                "Convert with R: haven::read_dta() then write.csv()"
+            )
 
         print(f"Loaded {len(df)} survey responses")
 
         observations = []
 
-        # Get variable mapping for this wave
-        if year not in self.WAVE_MAPPINGS:
-            raise ValueError(f"No variable mapping for CES {year}")
-
-        mapping: dict[str, Any] = self.WAVE_MAPPINGS[year]
-
         # Interpersonal trust
-        if "interpersonal" in mapping:
+        if mapping.interpersonal:
             inter_obs = self._calculate_interpersonal_trust(
-                df, year, mapping["interpersonal"]
+                df, year, mapping.interpersonal
             )
             if inter_obs:
                 observations.append(inter_obs)
 
         # Institutional trust
-        if "institutional" in mapping:
+        if mapping.institutional:
             inst_obs = self._calculate_institutional_trust(
-                df, year, mapping["institutional"]
+                df, year, mapping.institutional
             )
             if inst_obs:
                 observations.append(inst_obs)
@@ -178,40 +246,108 @@ class CESProcessor(BaseProcessor):
         print(f"Processed {len(observations)} CES observations for {year}")
         return observations
 
-    def _calculate_interpersonal_trust(
-        self, df: pd.DataFrame, year: int, config: Dict[str, Any]
-    ) -> Optional[Observation]:
+    @staticmethod
+    def _present_columns(input_path: Path, columns: List[str]) -> List[str]:
+        """
+        Keep the given columns that a CES data file actually has.
+
+        Args:
+            input_path: CES .dta or .csv file
+            columns: Candidate column names
+
+        Returns:
+            The candidates present in the file header, in the given order
+        """
+        if input_path.suffix == ".csv":
+            names = pd.read_csv(input_path, nrows=0).columns
+        else:
+            try:
+                import pyreadstat
+            except ImportError:
+                with pd.read_stata(input_path, iterator=True) as reader:
+                    names = list(reader.variable_labels())
+            else:
+                _, meta = pyreadstat.read_dta(str(input_path), metadataonly=True)
+                names = meta.column_names
+
+        available = set(names)
+        return [c for c in columns if c in available]
+
+    def _read_columns(self, input_path: Path, columns: List[str]) -> pd.DataFrame:
+        """
+        Read only the given columns from a CES data file.
+
+        CES Stata files carry hundreds of variables but each wave uses one or
+        two, so the column projection is pushed into the reader. Columns
+        missing from the file are skipped and reported by the callers.
         """
-        Calculate interpersonal trust percentage.
+        if input_path.suffix == ".csv":
+            return read_csv(input_path, columns=columns)
+
+        try:
+            import pyreadstat
+        except ImportError:
+            return self._read_stata_chunks(input_path, columns)
+
+        _, meta = pyreadstat.read_dta(str(input_path), metadataonly=True)
+        available = set(meta.column_names)
+        present = [c for c in columns if c in available]
+        if not present:
+            return pd.DataFrame(index=pd.RangeIndex(meta.number_rows))
+        df, _ = pyreadstat.read_dta(
+            str(input_path), usecols=present, disable_datetime_conversion=True
+        )
+        return df
 
-        Config contains:
-        - column: column name
-        - trust_value: value indicating "can trust"
-        - careful_value: value indicating "can't be too careful"
-        - scale_type: "binary" for trust/careful questions
+    def _read_stata_chunks(self, input_path: Path, columns: List[str]) -> pd.DataFrame:
         """
-        col = config["column"]
+        Read the given columns from a Stata file with pandas, chunk by chunk.
+
+        pandas materializes every variable it reads, so the file is streamed
+        in STATA_CHUNK_SIZE-row chunks and only the projected columns of each
+        are kept.
+        """
+        with pd.read_stata(
+            input_path,
+            convert_categoricals=False,
+            convert_dates=False,
+            chunksize=self.STATA_CHUNK_SIZE,
+        ) as reader:
+            available = set(reader.variable_labels())
+            present = [c for c in columns if c in available]
+            chunks = [chunk[present] for chunk in reader]
+        return (
+            pd.concat(chunks, ignore_index=True)
+            if chunks
+            else pd.DataFrame(columns=present)
+        )
+
+    def _calculate_interpersonal_trust(
+        self, df: pd.DataFrame, year: int, config: InterpersonalConfig
+    ) -> Optional[Observation]:
+        """Calculate interpersonal trust percentage."""
+        col = config.column
         if col not in df.columns:
             print(f"  Interpersonal trust column '{col}' not found")
             return None
 
-        trust_val = config["trust_value"]
-        careful_val = config["careful_value"]
-
-        # Filter to valid responses (trust or careful only)
-        valid = df[col].dropna()
-        valid = valid[valid.isin([trust_val, careful_val])]
+        # Valid responses are trust or careful only
+        n, n_trust = _binary_counts(
+            _response_values(df[col]),
+            config.trust_value,
+            config.careful_value,
+        )
 
-        if len(valid) < self.MIN_SAMPLE_SIZE:
+        if n < self.MIN_SAMPLE_SIZE:
             print(
-                f"  Interpersonal: insufficient sample ({len(valid)} < {self.MIN_SAMPLE_SIZE})"
+                f"  Interpersonal: insufficient sample ({n} < {self.MIN_SAMPLE_SIZE})"
             )
             return None
 
         # % saying "can be trusted"
-        pct_trust = float((valid == trust_val).mean() * 100)
+        pct_trust = float(n_trust / n * 100)
 
-        print(f"  Interpersonal trust: {pct_trust:.1f}% (n={len(valid)})")
+        print(f"  Interpersonal trust: {pct_trust:.1f}% (n={n})")
 
         return Observation(
             iso3="CAN",
@@ -221,47 +357,39 @@ class CESProcessor(BaseProcessor):
             raw_value=round(pct_trust, 1),
             raw_unit="% can trust",
             score_0_100=round(pct_trust, 1),
-            sample_n=int(len(valid)),
-            method_notes=f"CES {col}, n={len(valid)}",
+            sample_n=n,
+            method_notes=f"CES {col}, n={n}",
             source_url="https://ces-eec.arts.ubc.ca",
             methodology="binary",
         )
 
     def _calculate_institutional_trust(
-        self, df: pd.DataFrame, year: int, config: Dict[str, Any]
+        self, df: pd.DataFrame, year: int, config: InstitutionalConfig
     ) -> Optional[Observation]:
-        """
-        Calculate institutional trust from satisfaction scale.
-
-        Config contains:
-        - column: column name
-        - scale_type: "likert_5" (1-5) or "likert_7" (1-7)
-        - valid_range: tuple of (min, max) valid values
-        """
-        col = config["column"]
+        """Calculate institutional trust from satisfaction scale."""
+        col = config.column
         if col not in df.columns:
             print(f"  Institutional trust column '{col}' not found")
             return None
 
-        scale_type = config["scale_type"]
-        min_val, max_val = config["valid_range"]
+        scale_type = config.scale_type
+        min_val, max_val = config.valid_range
 
         # Filter valid responses
-        valid = df[col].dropna()
-        valid = valid[(valid >= min_val) & (valid <= max_val)]
+        n, mean = _range_mean(_response_values(df[col]), min_val, max_val)
 
-        if len(valid) < self.MIN_SAMPLE_SIZE:
+        if n < self.MIN_SAMPLE_SIZE:
             print(
-                f"  Institutional: insufficient sample ({len(valid)} < {self.MIN_SAMPLE_SIZE})"
+                f"  Institutional: insufficient sample ({n} < {self.MIN_SAMPLE_SIZE})"
             )
             return None
 
         # Normalize to 0-100 scale
-        # For any scale, map min->0, max->100
-        normalized = ((valid - min_val) / (max_val - min_val)) * 100
-        avg_score = float(normalized.mean())
+        # For any scale, map min->0, max->100. The mapping is linear, so it
+        # is applied to the mean rather than to every response.
+        avg_score = float((mean - min_val) / (max_val - min_val) * 100)
 
-        print(f"  Institutional trust: {avg_score:.1f} (n={len(valid)})")
+        print(f"  Institutional trust: {avg_score:.1f} (n={n})")
 
         return Observation(
             iso3="CAN",
@@ -271,12 +399,40 @@ class CESProcessor(BaseProcessor):
             raw_value=round(avg_score, 1),
             raw_unit=f"Normalized from {scale_type}",
             score_0_100=round(avg_score, 1),
-            sample_n=int(len(valid)),
-            method_notes=f"CES {col} fed govt satisfaction ({scale_type}), n={len(valid)}",
+            sample_n=n,
+            method_notes=f"CES {col} fed govt satisfaction ({scale_type}), n={n}",
             source_url="https://ces-eec.arts.ubc.ca",
         )
 
 
+def _process_year(year: int) -> Tuple[int, List[Observation], Optional[str]]:
+    """
+    Download and process one CES wave in a worker process.
+
+    Builds its own processor so nothing needs to be pickled on the way in.
+
+    Returns:
+        Tuple of (year, observations, error message or None)
+    """
+    print(f"\n{'='*50}")
+    print(f"Processing CES {year}")
+    print("=" * 50)
+
+    processor = CESProcessor()
+    try:
+        data_path = processor.download(year)
+        return year, processor.process(data_path, year), None
+    except FileNotFoundError as e:
+        print(f"Skipping {year}: {e}")
+        return year, [], "file not found"
+    except RuntimeError as e:
+        print(f"Skipping {year}: {e}")
+        return year, [], str(e)
+    except Exception as e:
+        print(f"Error processing {year}: {e}")
+        return year, [], str(e)
+
+
 @click.command()
 @click.option(
     "--year",
@@ -299,25 +455,19 @@ def main(year: Optional[int], dry_run: bool):
     processed_years = []
     failed_years = []
 
-    for y in years:
-        print(f"\n{'='*50}")
-        print(f"Processing CES {y}")
-        print("=" * 50)
+    # Each wave is an independent file parse, so run them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(years), os.cpu_count() or 1)) as ex:
+        futures = [ex.submit(_process_year, y) for y in years]
+        results = sorted(
+            (future.result() for future in as_completed(futures)), key=lambda r: r[0]
+        )
 
-        try:
-            data_path = processor.download(y)
-            observations = processor.process(data_path, y)
+    for y, observations, error in results:
+        if error is None:
             all_observations.extend(observations)
             processed_years.append(y)
-        except FileNotFoundError as e:
-            print(f"Skipping {y}: {e}")
-            failed_years.append((y, "file not found"))
-        except RuntimeError as e:
-            print(f"Skipping {y}: {e}")
-            failed_years.append((y, str(e)))
-        except Exception as e:
-            print(f"Error processing {y}: {e}")
-            failed_years.append((y, str(e)))
+        else:
+            failed_years.append((y, error))
 
     # Summary
     print(f"\n{'='*50}")
@@ -8,16 +8,19 @@ Data source: DataHub.io (pre-processed TI data) or Transparency International di
 
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 import click
+import openpyxl
 import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.base import BaseProcessor, Observation, observations_from_frame
+from common.cache import read_cached
+from common.readers import read_csv
 
 
 class CPIProcessor(BaseProcessor):
@@ -33,6 +36,9 @@ class CPIProcessor(BaseProcessor):
         2022: "https://images.transparencycdn.org/images/CPI2022_GlobalResultsTrends.xlsx",
     }
 
+    # TI workbook sheets that are never the main scores table
+    TI_SKIP_SHEETS = ("timeseries", "change", "regional", "historical")
+
     # Fallback pattern for older years
     TI_MEDIA_KIT_URL = (
         "https://images.transparencycdn.org/images/CPI{year}_Global_Results_Trends.xlsx"
@@ -81,51 +87,11 @@ class CPIProcessor(BaseProcessor):
 
         self.http_client.download_file(url, xlsx_path)
 
-        # Read Excel - TI files have varying sheet structures
-        xl = pd.ExcelFile(xlsx_path)
-        df = None
-
-        # Try common sheet names - look for the main CPI scores sheet
-        for sheet_name in xl.sheet_names:
-            sheet_lower = sheet_name.lower()
-            # Skip timeseries, changes, regional averages sheets
-            if any(
-                x in sheet_lower
-                for x in ["timeseries", "change", "regional", "historical"]
-            ):
-                continue
-            if "cpi" in sheet_lower and str(year) in sheet_name:
-                # TI files have multiple header rows (title, embargo notice, blank, then actual headers)
-                # Read without header first to find the actual header row
-                df_raw = pd.read_excel(
-                    xlsx_path, sheet_name=sheet_name, header=None, nrows=10
-                )
-                header_row = None
-                for i, row in df_raw.iterrows():
-                    if any(
-                        "country" in str(val).lower()
-                        for val in row.values
-                        if pd.notna(val)
-                    ):
-                        header_row = i
-                        break
-                if header_row is not None:
-                    df = pd.read_excel(
-                        xlsx_path, sheet_name=sheet_name, header=header_row
-                    )
-                    break
+        target_sheet, header_row = self._detect_sheet_header(xlsx_path, year)
 
-        if df is None:
-            # Fall back to first sheet, auto-detect header row
-            df_raw = pd.read_excel(xlsx_path, sheet_name=0, header=None, nrows=10)
-            header_row = 0
-            for i, row in df_raw.iterrows():
-                if any(
-                    "country" in str(val).lower() for val in row.values if pd.notna(val)
-                ):
-                    header_row = i
-                    break
-            df = pd.read_excel(xlsx_path, sheet_name=0, header=header_row)
+        df = pd.read_excel(
+            xlsx_path, sheet_name=target_sheet, header=header_row, engine="openpyxl"
+        )
 
         # Clean up - remove empty rows
         df = df.dropna(how="all")
@@ -134,17 +100,21 @@ class CPIProcessor(BaseProcessor):
         df.columns = [str(c).strip() for c in df.columns]
 
         # Rename common column variations for consistency
-        rename_map = {}
-        for col in df.columns:
-            col_lower = col.lower()
-            if "country" in col_lower or "territory" in col_lower:
-                rename_map[col] = "Country"
-            elif "cpi score" in col_lower or (
-                "cpi" in col_lower and str(year) in col_lower
-            ):
-                rename_map[col] = f"CPI Score {year}"
-            elif col_lower == "iso3":
-                rename_map[col] = "ISO3"
+        cols = df.columns.str.lower()
+        is_country = cols.str.contains("country|territory")
+        is_score = ~is_country & (
+            cols.str.contains("cpi score", regex=False)
+            | (
+                cols.str.contains("cpi", regex=False)
+                & cols.str.contains(str(year), regex=False)
+            )
+        )
+        is_iso = ~is_country & ~is_score & (cols == "iso3")
+        rename_map = {
+            **dict.fromkeys(df.columns[is_country], "Country"),
+            **dict.fromkeys(df.columns[is_score], f"CPI Score {year}"),
+            **dict.fromkeys(df.columns[is_iso], "ISO3"),
+        }
 
         if rename_map:
             df = df.rename(columns=rename_map)
@@ -154,6 +124,86 @@ class CPIProcessor(BaseProcessor):
 
         return csv_path
 
+    def _detect_sheet_header(self, xlsx_path: Path, year: int) -> Tuple[str, int]:
+        """
+        Scan a TI workbook for the CPI scores sheet and its header row.
+
+        Args:
+            xlsx_path: Downloaded TI workbook
+            year: Year being processed
+
+        Returns:
+            Tuple of (sheet name, 0-based header row)
+        """
+        # TI files have varying sheet structures. Open the workbook once in
+        # read-only mode and peek at the top rows of candidate sheets.
+        wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+        try:
+            # Filter on sheet names before reading any cells: only the main
+            # CPI scores sheet for this year is worth peeking at
+            candidate_sheets = [
+                name
+                for name in wb.sheetnames
+                if "cpi" in name.lower()
+                and str(year) in name
+                and not any(x in name.lower() for x in self.TI_SKIP_SHEETS)
+            ]
+            for sheet_name in candidate_sheets:
+                # TI files have multiple header rows (title, embargo notice, blank, then actual headers)
+                header_row = self._find_header_row(self._peek_rows(wb[sheet_name]))
+                if header_row is not None:
+                    return sheet_name, header_row
+
+            # Fall back to first sheet, auto-detect header row
+            first_sheet: str = wb.sheetnames[0]
+            if first_sheet in candidate_sheets:
+                # Already peeked above without finding a header row
+                return first_sheet, 0
+            return (
+                first_sheet,
+                self._find_header_row(self._peek_rows(wb[first_sheet])) or 0,
+            )
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _peek_rows(worksheet, n_rows: int = 10) -> pd.DataFrame:
+        """
+        Read the top rows of a worksheet without a header.
+
+        Args:
+            worksheet: openpyxl worksheet (read-only mode is fine)
+            n_rows: Number of rows to read
+
+        Returns:
+            DataFrame of raw cell values
+        """
+        return pd.DataFrame(
+            list(worksheet.iter_rows(min_row=1, max_row=n_rows, values_only=True))
+        )
+
+    @staticmethod
+    def _find_header_row(df_raw: pd.DataFrame) -> Optional[int]:
+        """
+        Find the header row in the top rows of a TI sheet read without headers.
+
+        TI files have title, embargo notice and blank rows above the real
+        header, which is the first row with a cell mentioning "country".
+
+        Args:
+            df_raw: First rows of the sheet, read with header=None
+
+        Returns:
+            Row index of the header, or None if no row matches
+        """
+        matches = df_raw.apply(
+            lambda col: col.astype("string")
+            .str.lower()
+            .str.contains("country", na=False)
+        )
+        rows = matches.any(axis=1)
+        return int(rows.idxmax()) if rows.any() else None
+
     def process(self, input_path: Path, year: int) -> List[Observation]:
         """
         Process CPI data into observations.
@@ -169,12 +219,18 @@ class CPIProcessor(BaseProcessor):
         Returns:
             List of Observation objects
         """
-        df = pd.read_csv(input_path)
+        # Read only the columns the detected format uses; the DataHub file
+        # carries one column per year but only the requested one is needed
+        header = pd.read_csv(input_path, nrows=0).columns
+        columns = self._format_columns(header, year)
+        df = read_cached(
+            input_path, lambda: read_csv(input_path, columns=columns), columns=columns
+        )
         observations = []
 
         # Detect format and process accordingly
         if "Jurisdiction" in df.columns:
-            observations = self._process_datahub_format(df, year)
+            observations = self._process_datahub_format(df, year, header)
         elif "country" in df.columns and "iso" in df.columns and "score" in df.columns:
             # Legacy format (pre-2012): 0-10 scale
             observations = self._process_legacy_format(df, year)
@@ -186,6 +242,85 @@ class CPIProcessor(BaseProcessor):
         print(f"Processed {len(observations)} CPI observations for {year}")
         return observations
 
+    @staticmethod
+    def _format_columns(header: pd.Index, year: int) -> Optional[List[str]]:
+        """
+        Get the columns a CPI file format needs, based on its header.
+
+        Args:
+            header: Column names of the CSV file
+            year: Year to extract
+
+        Returns:
+            Column names to read, or None to read every column (TI format,
+            whose score column is detected from the data)
+        """
+        if "Jurisdiction" in header and str(year) in header:
+            return ["Jurisdiction", str(year)]
+        if {"country", "iso", "score"} <= set(header):
+            return ["country", "iso", "score"]
+        return None
+
+    def _build_observations(
+        self,
+        iso3: pd.Series,
+        names: pd.Series,
+        scores: pd.Series,
+        year: int,
+        raw_unit: str,
+        method_notes: str,
+        scale: float = 1.0,
+    ) -> List[Observation]:
+        """
+        Build observations from aligned ISO3, country name, and score columns.
+
+        Rows without an ISO3 code are recorded as unmapped; rows without a
+        numeric score are skipped.
+
+        Args:
+            iso3: ISO3 code per row (missing where unmapped)
+            names: Country name per row, for unmapped reporting
+            scores: Raw CPI score per row
+            year: Year being processed
+            raw_unit: Unit label for the raw score
+            method_notes: Method notes for every observation
+            scale: Multiplier converting the raw score to 0-100
+
+        Returns:
+            List of observations
+        """
+        unmapped = iso3.isna()
+        self.stats["unmapped_countries"].extend(names[unmapped].astype(str).tolist())
+
+        scores = pd.to_numeric(scores, errors="coerce")
+        keep = ~unmapped & scores.notna()
+        raw_values = scores[keep].astype(float)
+
+        result = pd.DataFrame(
+            {
+                "iso3": iso3[keep],
+                "raw_value": raw_values,
+                "score_0_100": raw_values * scale,
+            }
+        ).assign(
+            year=year,
+            source="CPI",
+            trust_type="governance",
+            raw_unit=raw_unit,
+            method_notes=method_notes,
+            source_url=f"https://www.transparency.org/en/cpi/{year}",
+        )
+        return observations_from_frame(result)
+
+    def _map_names(self, names: pd.Series) -> pd.Series:
+        """Map a column of country names to ISO3 codes (NaN where unmapped)."""
+        # Names repeat across rows, so resolve each distinct name only once
+        lookup = {
+            name: self.country_mapper.get_iso3_from_name(name)
+            for name in names.dropna().unique()
+        }
+        return names.map(lookup)
+
     def _process_legacy_format(self, df: pd.DataFrame, year: int) -> List[Observation]:
         """
         Process legacy TI format (pre-2012) with 0-10 scale.
@@ -200,93 +335,57 @@ class CPIProcessor(BaseProcessor):
         Returns:
             List of observations
         """
-        observations = []
-
-        for _, row in df.iterrows():
-            iso3 = row.get("iso")
-            country_name = row.get("country")
-
-            if not iso3 or pd.isna(iso3):
-                iso3 = self.country_mapper.get_iso3_from_name(str(country_name))
-
-            if not iso3:
-                self.stats["unmapped_countries"].append(str(country_name))
-                continue
-
-            cpi_score = row.get("score")
-            if pd.isna(cpi_score):
-                continue
-
-            # Legacy CPI is 0-10, convert to 0-100
-            score_0_100 = float(cpi_score) * 10
-
-            observations.append(
-                Observation(
-                    iso3=iso3,
-                    year=year,
-                    source="CPI",
-                    trust_type="governance",
-                    raw_value=float(cpi_score),
-                    raw_unit="CPI Score (0-10 legacy)",
-                    score_0_100=score_0_100,
-                    sample_n=None,
-                    method_notes=f"Transparency International CPI {year} (0-10 scale, converted)",
-                    source_url=f"https://www.transparency.org/en/cpi/{year}",
-                )
-            )
-
-        return observations
-
-    def _process_datahub_format(self, df: pd.DataFrame, year: int) -> List[Observation]:
+        names = df["country"].astype(str)
+
+        # Prefer the file's ISO code, falling back to name lookup
+        iso3 = df["iso"].where(df["iso"].notna() & (df["iso"] != ""))
+        missing = iso3.isna()
+        iso3 = iso3.astype(object)
+        iso3[missing] = self._map_names(names[missing])
+
+        # Legacy CPI is 0-10, convert to 0-100
+        return self._build_observations(
+            iso3,
+            names,
+            df["score"],
+            year,
+            raw_unit="CPI Score (0-10 legacy)",
+            method_notes=f"Transparency International CPI {year} (0-10 scale, converted)",
+            scale=10.0,
+        )
+
+    def _process_datahub_format(
+        self, df: pd.DataFrame, year: int, header: pd.Index
+    ) -> List[Observation]:
         """
         Process DataHub.io format (years as columns).
 
         Args:
             df: DataFrame with Jurisdiction and year columns
             year: Year to extract
+            header: Column names of the CSV file (df holds only those read)
 
         Returns:
             List of observations
         """
-        observations = []
         year_col = str(year)
 
         if year_col not in df.columns:
-            available_years = [c for c in df.columns if c.isdigit()]
+            available_years = [c for c in header if c.isdigit()]
             raise ValueError(
                 f"Year {year} not found in data. Available years: {available_years}"
             )
 
-        for _, row in df.iterrows():
-            country_name = row["Jurisdiction"]
-            iso3 = self.country_mapper.get_iso3_from_name(country_name)
-
-            if not iso3:
-                self.stats["unmapped_countries"].append(country_name)
-                continue
-
-            cpi_score = row[year_col]
-
-            if pd.isna(cpi_score):
-                continue
-
-            # CPI scores are already 0-100, higher = less corrupt (better governance)
-            observations.append(
-                Observation(
-                    iso3=iso3,
-                    year=year,
-                    source="CPI",
-                    trust_type="governance",
-                    raw_value=float(cpi_score),
-                    raw_unit="CPI Score (0-100)",
-                    score_0_100=float(cpi_score),
-                    sample_n=None,
-                    method_notes=f"Transparency International CPI {year}",
-                    source_url=f"https://www.transparency.org/en/cpi/{year}",
-                )
-            )
-
-        return observations
+        # CPI scores are already 0-100, higher = less corrupt (better governance)
+        names = df["Jurisdiction"]
+        return self._build_observations(
+            self._map_names(names),
+            names,
+            df[year_col],
+            year,
+            raw_unit="CPI Score (0-100)",
+            method_notes=f"Transparency International CPI {year}",
+        )
 
     def _process_ti_format(self, df: pd.DataFrame, year: int) -> List[Observation]:
         """
@@ -299,63 +398,44 @@ class CPIProcessor(BaseProcessor):
         Returns:
             List of observations
         """
-        observations = []
-
         # Find the score column (various naming conventions)
-        score_col = None
-        for col in df.columns:
-            if f"CPI {year}" in col or f"CPI Score {year}" in col or col == "CPI Score":
-                score_col = col
-                break
-
-        if not score_col:
-            # Try to find any numeric column that looks like scores
-            for col in df.columns:
-                if "score" in col.lower() or "cpi" in col.lower():
-                    score_col = col
-                    break
+        exact = df.columns.str.contains(
+            rf"CPI {year}|CPI Score {year}|^CPI Score$", regex=True
+        )
+        # Otherwise any column that looks like scores
+        loose = df.columns.str.lower().str.contains("score|cpi", regex=True)
+        matches = df.columns[exact] if exact.any() else df.columns[loose]
+        score_col = matches[0] if len(matches) else None
 
         if not score_col:
             raise ValueError(
                 f"Could not find CPI score column in {df.columns.tolist()}"
             )
 
-        for _, row in df.iterrows():
-            # Try different column names for country
-            country_name = (
-                row.get("Country") or row.get("Jurisdiction") or row.get("country")
-            )
-
-            # Try to get ISO3 directly if available
-            iso3 = row.get("ISO3") or row.get("iso3")
-            if not iso3:
-                iso3 = self.country_mapper.get_iso3_from_name(str(country_name))
-
-            if not iso3:
-                self.stats["unmapped_countries"].append(str(country_name))
-                continue
-
-            cpi_score = row[score_col]
-
-            if pd.isna(cpi_score):
-                continue
-
-            observations.append(
-                Observation(
-                    iso3=iso3,
-                    year=year,
-                    source="CPI",
-                    trust_type="governance",
-                    raw_value=float(cpi_score),
-                    raw_unit="CPI Score (0-100)",
-                    score_0_100=float(cpi_score),
-                    sample_n=None,
-                    method_notes=f"Transparency International CPI {year}",
-                    source_url=f"https://www.transparency.org/en/cpi/{year}",
-                )
-            )
+        # Try different column names for country
+        country_col = next(
+            c for c in ("Country", "Jurisdiction", "country") if c in df.columns
+        )
+        names = df[country_col].astype(str)
 
-        return observations
+        # Use ISO3 directly if available, otherwise map from the name
+        iso_col = next((c for c in ("ISO3", "iso3") if c in df.columns), None)
+        if iso_col:
+            iso3 = df[iso_col].where(df[iso_col].notna() & (df[iso_col] != ""))
+        else:
+            iso3 = pd.Series(None, index=df.index)
+        missing = iso3.isna()
+        iso3 = iso3.astype(object)
+        iso3[missing] = self._map_names(names[missing])
+
+        return self._build_observations(
+            iso3,
+            names,
+            df[score_col],
+            year,
+            raw_unit="CPI Score (0-100)",
+            method_notes=f"Transparency International CPI {year}",
+        )
 
 
 @click.command()
@@ -18,9 +18,10 @@ Coverage: ~35 European countries per round (biennial since 2002)
 import os
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 import click
+import numpy as np
 import pandas as pd
 
 # Add project root to path
@@ -28,9 +29,45 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from common.base import BaseProcessor, Observation
+from common.cache import cache_chunks, load_cached
 from common.scaling import scale_0_10_to_percent
 
 
+def _valid_sums_counts(
+    codes: np.ndarray, values: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum and count the valid 0-10 answers per group, column by column.
+
+    Args:
+        codes: Group code per row (-1 for rows without a group)
+        values: 2-D array of answers, one column per trust variable
+        n_groups: Number of groups
+
+    Returns:
+        Tuple of (sums, counts) arrays of shape (n_groups, n_columns)
+    """
+    # NaN fails both comparisons, so missing answers are not valid
+    valid = (values >= 0) & (values <= 10) & (codes >= 0)[:, None]
+    sums = np.zeros((n_groups, values.shape[1]))
+    counts = np.zeros((n_groups, values.shape[1]), dtype=np.int64)
+    for j in range(values.shape[1]):
+        rows = valid[:, j]
+        sums[:, j] = np.bincount(
+            codes[rows], weights=values[rows, j], minlength=n_groups
+        )
+        counts[:, j] = np.bincount(codes[rows], minlength=n_groups)
+    return sums, counts
+
+
+_Aggregate = TypeVar("_Aggregate", pd.DataFrame, pd.Series)
+
+
+def _accumulate(total: Optional[_Aggregate], part: _Aggregate) -> _Aggregate:
+    """Add a chunk's grouped aggregates to the running total."""
+    return part if total is None else total.add(part, fill_value=0)
+
+
 class ESSProcessor(BaseProcessor):
     """Processor for European Social Survey data."""
 
@@ -53,6 +90,12 @@ class ESSProcessor(BaseProcessor):
 
     # Minimum sample size
     MIN_SAMPLE_SIZE = 300
+    MIN_VAR_SAMPLE_SIZE = 100  # Per institutional variable
+
+    CSV_CHUNK_SIZE = 500_000  # Rows per chunk when streaming ESS CSVs
+
+    # Institutional trust variables (lower-case; files vary in case)
+    INSTITUTIONAL_VARS = ("trstprl", "trstplt", "trstgov")
 
     def download(self, year: int) -> Path:
         """
@@ -138,37 +181,113 @@ class ESSProcessor(BaseProcessor):
         """
         print(f"Loading ESS data from {input_path}...")
 
-        # Try to load with common column names
+        # ESS files carry hundreds of variables; pick the few used from the header
         try:
-            df = pd.read_csv(input_path, low_memory=False)
+            header = pd.read_csv(input_path, nrows=0).columns
         except Exception as e:
             print(f"Error loading CSV: {e}")
             return []
 
-        print(f"Loaded {len(df)} survey responses")
-
-        observations = []
+        # Look up columns case-insensitively (files vary: cntry/CNTRY, ...);
+        # the first spelling in the file wins
+        col_index: Dict[str, str] = {}
+        for col in header:
+            col_index.setdefault(col.lower(), col)
 
         # Find country column (ESS uses 'cntry' or 'cntry_num')
-        country_col = None
-        for col in ["cntry", "CNTRY", "country", "cntry_num"]:
-            if col in df.columns:
-                country_col = col
-                break
+        country_col = next(
+            (col_index[c] for c in ["cntry", "country", "cntry_num"] if c in col_index),
+            None,
+        )
 
         if not country_col:
-            print(f"Could not find country column in: {df.columns.tolist()[:20]}")
+            print(f"Could not find country column in: {header.tolist()[:20]}")
             return []
 
         # Find year column if available
-        year_col = None
-        for col in ["inwyys", "inwyr", "essround"]:
-            if col in df.columns:
-                year_col = col
-                break
-
-        # Process each country
-        for country_code, country_df in df.groupby(country_col):
+        year_col = next(
+            (col_index[c] for c in ["inwyys", "inwyr", "essround"] if c in col_index),
+            None,
+        )
+
+        inter_cols = [col_index["ppltrst"]] if "ppltrst" in col_index else []
+        inst_cols = [col_index[v] for v in self.INSTITUTIONAL_VARS if v in col_index]
+        trust_cols = inter_cols + inst_cols
+
+        if not trust_cols:
+            print(f"Could not find trust variables in: {header.tolist()[:20]}")
+            return []
+
+        needed_cols = [country_col, *([year_col] if year_col else []), *trust_cols]
+
+        # Reuse the parsed columns from a previous run while the file is
+        # unchanged; otherwise stream the CSV so large rounds fit in memory
+        cached = load_cached(input_path, columns=needed_cols)
+        if cached is not None:
+            chunks: Iterable[pd.DataFrame] = [cached]
+        else:
+            # Chunks are appended to the cache as they are parsed
+            chunks = cache_chunks(
+                input_path,
+                pd.read_csv(
+                    input_path,
+                    usecols=needed_cols,
+                    # 0-10 answers and 77/88/99 missing codes fit in a byte
+                    dtype={col: "Int8" for col in trust_cols},
+                    chunksize=self.CSV_CHUNK_SIZE,
+                    low_memory=False,
+                ),
+            )
+
+        # Per country: sum and count of valid answers for each trust variable,
+        # plus interview year counts, accumulated chunk by chunk
+        sums: Optional[pd.DataFrame] = None
+        counts: Optional[pd.DataFrame] = None
+        year_counts: Optional[pd.Series] = None
+        n_responses = 0
+
+        try:
+            for chunk in chunks:
+                n_responses += len(chunk)
+
+                # Codes outside 0-10 (refusals, don't know) are not counted
+                codes, countries = pd.factorize(chunk[country_col], sort=True)
+                chunk_sums, chunk_counts = _valid_sums_counts(
+                    codes,
+                    chunk[trust_cols].to_numpy(dtype=np.float32, na_value=np.nan),
+                    len(countries),
+                )
+                sums = _accumulate(
+                    sums, pd.DataFrame(chunk_sums, index=countries, columns=trust_cols)
+                )
+                counts = _accumulate(
+                    counts,
+                    pd.DataFrame(chunk_counts, index=countries, columns=trust_cols),
+                )
+
+                if year_col:
+                    year_counts = _accumulate(
+                        year_counts, chunk.groupby([country_col, year_col]).size()
+                    )
+        except Exception as e:
+            print(f"Error loading CSV: {e}")
+            return []
+
+        # Only the small per-country aggregates are needed from here on
+        del cached, chunks
+
+        print(f"Loaded {n_responses} survey responses")
+
+        observations: List[Observation] = []
+        if sums is None or counts is None:
+            return observations
+
+        # Plain per-country dicts of {variable: mean} and {variable: valid count}
+        means = (sums / counts).to_dict("index")
+        valid_counts = counts.to_dict("index")
+        survey_years = self._survey_years(year_counts)
+
+        for country_code, country_counts in valid_counts.items():
             # ESS uses ISO2 codes
             iso3 = self.country_mapper.get_iso3_from_iso2(str(country_code))
             if not iso3:
@@ -177,25 +296,18 @@ class ESSProcessor(BaseProcessor):
                 self.stats["unmapped_countries"].append(str(country_code))
                 continue
 
-            # Get survey year
-            if year_col and year_col in country_df.columns:
-                try:
-                    survey_year = int(country_df[year_col].mode().iloc[0])
-                except (ValueError, IndexError):
-                    survey_year = year
-            else:
-                survey_year = year
+            survey_year = survey_years.get(country_code, year)
 
             # Calculate interpersonal trust (ppltrst)
             inter_obs = self._calculate_interpersonal_trust(
-                country_df, iso3, survey_year
+                means[country_code], country_counts, inter_cols, iso3, survey_year
             )
             if inter_obs:
                 observations.append(inter_obs)
 
             # Calculate institutional trust (trstprl, trstplt)
             inst_obs = self._calculate_institutional_trust(
-                country_df, iso3, survey_year
+                means[country_code], country_counts, inst_cols, iso3, survey_year
             )
             if inst_obs:
                 observations.append(inst_obs)
@@ -203,8 +315,40 @@ class ESSProcessor(BaseProcessor):
         print(f"Processed {len(observations)} ESS observations")
         return observations
 
+    @staticmethod
+    def _survey_years(year_counts: Optional[pd.Series]) -> Dict[Any, int]:
+        """
+        Get the most common interview year per country.
+
+        Args:
+            year_counts: Response counts indexed by (country, interview year),
+                or None if the file has no year column
+
+        Returns:
+            Dict of country code to survey year; countries without a usable
+            year are left out
+        """
+        if year_counts is None:
+            return {}
+
+        # Like Series.mode(), ties go to the smallest year
+        survey_years = {}
+        for country_code, survey_year in (
+            year_counts.sort_index().groupby(level=0).idxmax()
+        ):
+            try:
+                survey_years[country_code] = int(survey_year)
+            except ValueError:
+                continue
+        return survey_years
+
     def _calculate_interpersonal_trust(
-        self, df: pd.DataFrame, iso3: str, year: int
+        self,
+        means: Dict[str, float],
+        counts: Dict[str, float],
+        trust_cols: List[str],
+        iso3: str,
+        year: int,
     ) -> Optional[Observation]:
         """
         Calculate interpersonal trust from ppltrst.
@@ -213,32 +357,25 @@ class ESSProcessor(BaseProcessor):
         Scale: 0 (can't be too careful) to 10 (most people can be trusted)
 
         Args:
-            df: Country DataFrame
+            means: Country's mean valid response per variable
+            counts: Country's number of valid responses per variable
+            trust_cols: ppltrst column, if the file has one
             iso3: ISO3 country code
             year: Survey year
 
         Returns:
             Observation or None if insufficient data
         """
-        # Find the trust variable (case-insensitive)
-        trust_col = None
-        for col in df.columns:
-            if col.lower() == "ppltrst":
-                trust_col = col
-                break
-
-        if not trust_col:
+        if not trust_cols:
             return None
 
-        # Filter valid responses (0-10)
-        valid = df[trust_col].between(0, 10)
-        responses = df.loc[valid, trust_col]
-
-        if len(responses) < self.MIN_SAMPLE_SIZE:
+        trust_col = trust_cols[0]
+        n = int(counts[trust_col])
+        if n < self.MIN_SAMPLE_SIZE:
             return None
 
         # Calculate mean and convert to 0-100
-        mean_score = responses.mean()
+        mean_score = means[trust_col]
         score_0_100 = scale_0_10_to_percent(mean_score)
 
         return Observation(
@@ -249,14 +386,19 @@ class ESSProcessor(BaseProcessor):
             raw_value=round(mean_score, 2),
             raw_unit="Mean (0-10 scale)",
             score_0_100=round(score_0_100, 1),
-            sample_n=len(responses),
-            method_notes=f"ESS ppltrst mean, n={len(responses)}",
+            sample_n=n,
+            method_notes=f"ESS ppltrst mean, n={n}",
             source_url="https://www.europeansocialsurvey.org",
             methodology="0-10scale",
         )
 
     def _calculate_institutional_trust(
-        self, df: pd.DataFrame, iso3: str, year: int
+        self,
+        means: Dict[str, float],
+        counts: Dict[str, float],
+        trust_vars: List[str],
+        iso3: str,
+        year: int,
     ) -> Optional[Observation]:
         """
         Calculate institutional trust from trstprl and trstplt.
@@ -265,34 +407,29 @@ class ESSProcessor(BaseProcessor):
         trstplt: Trust in politicians (0-10)
 
         Args:
-            df: Country DataFrame
+            means: Country's mean valid response per variable
+            counts: Country's number of valid responses per variable
+            trust_vars: Institutional trust columns present in the file
             iso3: ISO3 country code
             year: Survey year
 
         Returns:
             Observation or None if insufficient data
         """
-        trust_vars = []
-        for col in df.columns:
-            if col.lower() in ["trstprl", "trstplt", "trstgov"]:
-                trust_vars.append(col)
-
         if not trust_vars:
             return None
 
-        # Calculate mean for each available variable
+        # Use each variable with enough valid responses
         var_means = []
         total_n = 0
 
         for var in trust_vars:
-            valid = df[var].between(0, 10)
-            responses = df.loc[valid, var]
-
-            if len(responses) < 100:
+            n = int(counts[var])
+            if n < self.MIN_VAR_SAMPLE_SIZE:
                 continue
 
-            var_means.append(responses.mean())
-            total_n = max(total_n, len(responses))
+            var_means.append(means[var])
+            total_n = max(total_n, n)
 
         if not var_means or total_n < self.MIN_SAMPLE_SIZE:
             return None
@@ -92,6 +92,10 @@ class EurobarometerProcessor(BaseProcessor):
 
     SOURCE_NAME = "Eurobarometer"
 
+    # Decode Stata files of at least this many rows with several processes
+    MULTIPROCESS_MIN_ROWS = 200_000
+    READ_PROCESSES = 4
+
     def download(self, year: int) -> Path:
         """Check for Eurobarometer data file."""
         eb_dir = self.raw_data_dir / "eurobarometer"
@@ -109,13 +113,6 @@ class EurobarometerProcessor(BaseProcessor):
         """Process Eurobarometer Stata data to observations."""
         observations = []
 
-        print(f"Reading {data_path.name}...")
-        df = pd.read_stata(data_path)
-        print(f"Loaded {len(df)} responses from {df['isocntry'].nunique()} countries")
-
-        # Data year from filename or survey
-        data_year = 2024
-
         # Key columns
         country_col = "isocntry"
         # Trust in institutions battery
@@ -124,38 +121,60 @@ class EurobarometerProcessor(BaseProcessor):
         parl_col = "qa6_9"  # National Parliament
         just_col = "qa6_3"  # Justice/Legal System
 
-        # Map country codes to ISO3
-        df["iso3"] = df[country_col].map(
-            lambda x: EB_COUNTRY_MAP.get(str(x)) if pd.notna(x) else None
+        print(f"Reading {data_path.name}...")
+        df = self._read_columns(
+            data_path, [country_col, media_col, govt_col, parl_col, just_col]
+        )
+        print(f"Loaded {len(df)} responses from {df['isocntry'].nunique()} countries")
+
+        # Data year from filename or survey
+        data_year = 2024
+
+        # Map country codes to ISO3 once per category. Several codes share an
+        # ISO3 (DE-W/DE-E) or map to None, so rename_categories() cannot be
+        # used; instead re-code the categories and build the ISO3 categorical
+        # from codes (missing countries have code -1 and stay missing).
+        countries = df[country_col].astype("category")
+        iso3_codes, iso3_categories = pd.factorize(
+            np.array(
+                [EB_COUNTRY_MAP.get(str(c)) for c in countries.cat.categories] + [None],
+                dtype=object,
+            )
+        )
+        df["iso3"] = pd.Categorical.from_codes(
+            iso3_codes[countries.cat.codes.to_numpy()], categories=iso3_categories
         )
 
         # Report unmapped
-        unmapped = df[df["iso3"].isna()][country_col].unique()
+        unmapped = df.loc[df["iso3"].isna(), country_col].unique()
         for code in unmapped:
             if pd.notna(code) and str(code) not in EB_COUNTRY_MAP:
                 print(f"Unmapped country: {code}")
 
-        # Process by ISO3 (aggregates DE-W/DE-E into DEU, etc.)
-        for iso3 in df["iso3"].dropna().unique():
-            country_df = df[df["iso3"] == iso3]
-            sample_n = len(country_df)
-
-            # Calculate trust percentage for each institution
-            trust_scores = []
-
-            for col, inst_name in [
-                (govt_col, "government"),
-                (parl_col, "parliament"),
-                (just_col, "justice"),
-            ]:
-                if col not in df.columns:
-                    continue
+        # Encode each trust item once ("Tend to trust" -> 100, other answers
+        # -> NaN), then get every country's mean and valid count in one pass
+        available = set(df.columns)
+        inst_cols = [c for c in (govt_col, parl_col, just_col) if c in available]
+        has_media = media_col in available
+        score_cols = inst_cols + ([media_col] if has_media else [])
+        scores = pd.DataFrame(
+            {col: df[col].map(TRUST_MAP).astype(float) for col in score_cols},
+            index=df.index,
+        )
 
-                values = country_df[col].map(TRUST_MAP)
-                valid = values.dropna()
+        # Group by ISO3 (aggregates DE-W/DE-E into DEU, etc.)
+        grouped = scores.groupby(df["iso3"], sort=False, observed=True)
+        means = grouped.mean()
+        counts = grouped.count()
+        sample_sizes = grouped.size()
 
-                if len(valid) >= 50:
-                    trust_scores.append(float(valid.mean()))
+        for iso3, sample_n in sample_sizes.items():
+            # Trust percentage for each institution with enough answers
+            trust_scores = [
+                float(means.at[iso3, col])
+                for col in inst_cols
+                if counts.at[iso3, col] >= 50
+            ]
 
             # Create composite institutional trust score
             if len(trust_scores) >= 2:
@@ -163,7 +182,7 @@ class EurobarometerProcessor(BaseProcessor):
 
                 observations.append(
                     Observation(
-                        iso3=iso3,
+                        iso3=str(iso3),
                         year=data_year,
                         source=self.SOURCE_NAME,
                         trust_type="institutional",
@@ -177,22 +196,21 @@ class EurobarometerProcessor(BaseProcessor):
                 )
 
             # Create media trust observation
-            if media_col in df.columns:
-                media_values = country_df[media_col].map(TRUST_MAP)
-                valid_media = media_values.dropna()
+            if has_media:
+                n_media = int(counts.at[iso3, media_col])
 
-                if len(valid_media) >= 50:
-                    media_trust = float(valid_media.mean())
+                if n_media >= 50:
+                    media_trust = float(means.at[iso3, media_col])
                     observations.append(
                         Observation(
-                            iso3=iso3,
+                            iso3=str(iso3),
                             year=data_year,
                             source=self.SOURCE_NAME,
                             trust_type="media",
                             raw_value=round(media_trust, 1),
                             raw_unit="percent trust",
                             score_0_100=round(media_trust, 1),
-                            sample_n=int(len(valid_media)),
+                            sample_n=n_media,
                             method_notes="Eurobarometer 101.3 (Apr-May 2024), QA6_1: Trust in Media",
                             source_url="https://www.gesis.org/en/eurobarometer-data-service",
                         )
@@ -200,6 +218,50 @@ class EurobarometerProcessor(BaseProcessor):
 
         return observations
 
+    @classmethod
+    def _read_columns(cls, data_path: Path, columns: List[str]) -> pd.DataFrame:
+        """
+        Read only the given columns from a Eurobarometer Stata file.
+
+        The file holds the full questionnaire (hundreds of variables), so
+        only the used columns are parsed. Large files (e.g. trend files) are
+        decoded by several processes. Columns missing from the file are
+        skipped.
+
+        Args:
+            data_path: Eurobarometer .dta file
+            columns: Columns to read
+
+        Returns:
+            DataFrame with value labels applied
+        """
+        try:
+            import pyreadstat
+        except ImportError:
+            # pandas parses every variable but only converts the kept ones
+            with pd.read_stata(data_path, iterator=True) as reader:
+                available = set(reader.variable_labels())
+                present = [c for c in columns if c in available]
+                return reader.read(columns=present)
+
+        _, meta = pyreadstat.read_dta(str(data_path), metadataonly=True)
+        available = set(meta.column_names)
+        present = [c for c in columns if c in available]
+        if meta.number_rows and meta.number_rows >= cls.MULTIPROCESS_MIN_ROWS:
+            df, _ = pyreadstat.read_file_multiprocessing(
+                pyreadstat.read_dta,
+                str(data_path),
+                num_processes=cls.READ_PROCESSES,
+                num_rows=meta.number_rows,
+                usecols=present,
+                apply_value_formats=True,
+            )
+        else:
+            df, _ = pyreadstat.read_dta(
+                str(data_path), usecols=present, apply_value_formats=True
+            )
+        return df
+
 
 @click.command()
 @click.option("--year", type=int, default=None, help="Filter to specific year")
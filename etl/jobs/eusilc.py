@@ -12,18 +12,23 @@ Coverage: 38 European countries including Malta, Kosovo, candidate countries
 Years: 2013, 2018, 2021-2024
 """
 
+import gzip
+import hashlib
+import json
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict, List
 
 import click
-import requests
+import numpy as np
+import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.base import BaseProcessor, Observation, observations_from_frame
 
 # Eurostat country codes to ISO alpha-3
 EUROSTAT_TO_ISO3 = {
@@ -74,6 +79,7 @@ class EUSILCProcessor(BaseProcessor):
     API_URL = (
         "https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0/data/ilc_pw03"
     )
+    CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds to reuse a downloaded response
 
     def download(self, year: int) -> Dict[str, Any]:  # type: ignore[override]
         """Fetch EU-SILC trust data from Eurostat API."""
@@ -85,63 +91,81 @@ class EUSILCProcessor(BaseProcessor):
             "isced11": "TOTAL",  # All education levels
         }
 
-        response = requests.get(self.API_URL, params=params, timeout=30)
-        response.raise_for_status()
-        result: Dict[str, Any] = response.json()
+        # EU-SILC is updated yearly, so reuse a recent response for the same query
+        key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        cache_path = self.raw_data_dir / "eusilc" / f"ilc_pw03_{key[:16]}.json.gz"
+        if (
+            cache_path.exists()
+            and time.time() - cache_path.stat().st_mtime < self.CACHE_MAX_AGE
+        ):
+            print(f"Using cached Eurostat response {cache_path}")
+            cached: Dict[str, Any] = json.loads(
+                gzip.decompress(cache_path.read_bytes())
+            )
+            return cached
+
+        # Shared session: keep-alive, gzip (requests' default Accept-Encoding)
+        # and retries with backoff
+        result = self.http_client.get_json(self.API_URL, params)
+        if not isinstance(result, dict):
+            raise ValueError("Unexpected Eurostat response: expected a JSON object")
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(gzip.compress(json.dumps(result).encode()))
         return result
 
     def process(self, data: Dict[str, Any], year: int) -> List[Observation]:  # type: ignore[override]
         """Process Eurostat JSON response to observations."""
-        observations = []
-
-        values = data.get("value", {})
+        # JSON object keys are strings; convert the flat cell indices once
+        values = {int(idx): value for idx, value in data.get("value", {}).items()}
         dims = data.get("dimension", {})
 
         # Get dimension indices
         geo_idx = dims.get("geo", {}).get("category", {}).get("index", {})
         time_idx = dims.get("time", {}).get("category", {}).get("index", {})
 
-        num_times = len(time_idx)
-
-        for geo_code, geo_pos in geo_idx.items():
-            # Skip aggregates
-            if geo_code in ["EU27_2020", "EA20"]:
-                continue
-
-            iso3 = EUROSTAT_TO_ISO3.get(geo_code)
-            if not iso3:
-                continue
-
-            for year_str, year_pos in time_idx.items():
-                # Calculate flat index
-                idx = str(geo_pos * num_times + year_pos)
-
-                if idx not in values:
-                    continue
-
-                # Value is 0-10 rating, convert to 0-100
-                raw_value = values[idx]
-                score = raw_value * 10  # 0-10 -> 0-100
-
-                data_year = int(year_str)
-
-                observations.append(
-                    Observation(
-                        iso3=iso3,
-                        year=data_year,
-                        source=self.SOURCE_NAME,
-                        trust_type="interpersonal",
-                        raw_value=round(raw_value, 1),
-                        raw_unit="rating 0-10",
-                        score_0_100=round(score, 1),
-                        sample_n=None,  # Not available in aggregated data
-                        method_notes=f"EU-SILC {data_year} ilc_pw03, 16+ population",
-                        source_url="https://ec.europa.eu/eurostat/databrowser/view/ilc_pw03",
-                        methodology="0-10scale",
-                    )
-                )
-
-        return observations
+        # Skip aggregates and unmapped codes before touching any values
+        geo_codes = [
+            geo_code
+            for geo_code in geo_idx
+            if geo_code not in ["EU27_2020", "EA20"] and geo_code in EUROSTAT_TO_ISO3
+        ]
+        time_codes = list(time_idx)
+        if not geo_codes or not time_codes or not values:
+            return []
+
+        # Flat JSON-stat index of every (geo, time) cell, in geo-major order
+        geo_pos = np.array([geo_idx[g] for g in geo_codes])
+        time_pos = np.array([time_idx[t] for t in time_codes])
+        flat = geo_pos[:, None] * len(time_idx) + time_pos[None, :]
+
+        # Only cells with a value are present in the sparse "value" dict
+        present = np.isin(flat, np.fromiter(values, dtype=flat.dtype))
+
+        geo_rows, time_cols = np.nonzero(present)
+        raw_values = [values[idx] for idx in flat[present].tolist()]
+        data_years = [int(time_codes[t]) for t in time_cols]
+
+        # Build all observations column-wise; value is 0-10 rating, convert to 0-100
+        result = pd.DataFrame(
+            {
+                "iso3": [EUROSTAT_TO_ISO3[geo_codes[g]] for g in geo_rows],
+                "year": data_years,
+                "raw_value": [round(v, 1) for v in raw_values],
+                "score_0_100": [round(v * 10, 1) for v in raw_values],
+                "method_notes": [
+                    f"EU-SILC {y} ilc_pw03, 16+ population" for y in data_years
+                ],
+            }
+        ).assign(
+            source=self.SOURCE_NAME,
+            trust_type="interpersonal",
+            raw_unit="rating 0-10",
+            sample_n=None,  # Not available in aggregated data
+            source_url="https://ec.europa.eu/eurostat/databrowser/view/ilc_pw03",
+            methodology="0-10scale",
+        )
+        return observations_from_frame(result)
 
 
 @click.command()
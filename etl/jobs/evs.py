@@ -20,19 +20,30 @@ EVS adds European coverage for countries with sparse/no WVS data:
 Iceland, Malta, Northern Ireland, etc.
 """
 
+import math
 import sys
+import traceback
 from collections import defaultdict
+from numbers import Real
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import click
+import numpy as np
 import pandas as pd
 
+try:
+    import pyreadstat
+except ImportError:
+    pyreadstat = None  # type: ignore[assignment]
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from common.agg import binary_trust_counts
 from common.base import BaseProcessor, Observation
+from common.cache import read_cached
 
 # EVS uses ISO 3166-1 numeric codes (same as WVS for overlap)
 # This mapping covers European countries in EVS
@@ -98,6 +109,20 @@ class EVSProcessor(BaseProcessor):
     # Minimum sample size from methodology
     MIN_SAMPLE_SIZE = 300
 
+    STATA_CHUNK_SIZE = 100_000  # Rows per chunk when streaming Stata files
+
+    # EVS Trend file columns (harmonized with WVS)
+    # Try different column name conventions
+    COLUMN_CANDIDATES = {
+        "country": ["S003", "c_aession", "country"],
+        "country_alpha": ["S003A", "c_aession_alpha", "COUNTRY_ALPHA"],
+        "year": ["S020", "year", "s020"],
+        "interpersonal": ["A165", "a165"],
+        "inst_parliament": ["E069_11", "e069_11"],
+        "inst_government": ["E069_12", "e069_12"],
+        "inst_parties": ["E069_13", "e069_13"],
+    }
+
     def download(self, year: int) -> Path:
         """
         EVS requires manual download - this method checks for available files.
@@ -144,25 +169,46 @@ class EVSProcessor(BaseProcessor):
         )
 
     def _convert_to_csv(self, stata_path: Path) -> Path:
-        """Convert SPSS/Stata file to CSV."""
+        """
+        Convert SPSS/Stata file to CSV.
+
+        Only the columns processing uses are kept, and the file is streamed
+        to the CSV in STATA_CHUNK_SIZE-row chunks rather than loaded whole.
+        """
         print(f"Converting {stata_path} to CSV...")
 
         if stata_path.suffix == ".dta":
-            df = pd.read_stata(str(stata_path), convert_categoricals=False)
+            with pd.read_stata(str(stata_path), iterator=True) as reader:
+                header = pd.Index(list(reader.variable_labels()))
+            usecols = self._used_columns(self._resolve_columns(header))
+            chunks = self._iter_stata_chunks(stata_path, usecols)
         else:
             # Try pyreadstat for SPSS
-            try:
-                import pyreadstat
-
-                df, _ = pyreadstat.read_sav(str(stata_path))
-            except ImportError:
+            if pyreadstat is None:
                 raise ImportError(
                     "pyreadstat required to read SPSS files. "
                     "Install with: pip install pyreadstat"
                 )
 
+            _, meta = pyreadstat.read_sav(str(stata_path), metadataonly=True)
+            usecols = self._used_columns(
+                self._resolve_columns(pd.Index(meta.column_names))
+            )
+            chunks = (
+                df
+                for df, _ in pyreadstat.read_file_in_chunks(
+                    pyreadstat.read_sav,
+                    str(stata_path),
+                    chunksize=self.STATA_CHUNK_SIZE,
+                    usecols=usecols,
+                )
+            )
+
         csv_path = stata_path.with_suffix(".csv")
-        df.to_csv(csv_path, index=False)
+        pd.DataFrame(columns=usecols).to_csv(csv_path, index=False)
+        for df in chunks:
+            # pyreadstat returns usecols in file order, not the requested order
+            df[usecols].to_csv(csv_path, mode="a", header=False, index=False)
         print(f"Saved CSV to {csv_path}")
         return csv_path
 
@@ -184,59 +230,64 @@ class EVSProcessor(BaseProcessor):
 
     def _process_trend_file(self, input_path: Path) -> List[Observation]:
         """Process EVS Trend file (all waves 1981-2017)."""
-        # EVS Trend file columns (harmonized with WVS)
-        # Try different column name conventions
-        possible_cols = {
-            "country": ["S003", "c_aession", "country"],
-            "country_alpha": ["S003A", "c_aession_alpha", "COUNTRY_ALPHA"],
-            "year": ["S020", "year", "s020"],
-            "interpersonal": ["A165", "a165"],
-            "inst_parliament": ["E069_11", "e069_11"],
-            "inst_government": ["E069_12", "e069_12"],
-            "inst_parties": ["E069_13", "e069_13"],
-        }
-
-        # Load with all potentially relevant columns
+        # Resolve columns from the header so only the used ones are parsed
         try:
-            df = pd.read_csv(input_path, low_memory=False)
+            header = pd.read_csv(input_path, nrows=0).columns
+            is_stata = False
         except Exception:
             # Try reading as Stata if CSV fails
-            df = pd.read_stata(str(input_path), convert_categoricals=False)
+            with pd.read_stata(str(input_path), iterator=True) as reader:
+                header = pd.Index(list(reader.variable_labels()))
+            is_stata = True
+
+        col_map = self._resolve_columns(header)
+        usecols = self._used_columns(col_map)
+        country_col, year_col = usecols[0], usecols[1]
+
+        # Reuse the parsed columns from a previous run while the file is unchanged
+        if is_stata:
+            df = read_cached(
+                input_path,
+                lambda: self._read_stata_columns(input_path, usecols),
+                columns=usecols,
+            )
+        else:
+            df = read_cached(
+                input_path,
+                lambda: pd.read_csv(input_path, usecols=usecols, low_memory=False),
+                columns=usecols,
+            )
 
         print(f"Loaded {len(df)} survey responses")
 
-        # Find actual column names
-        col_map = {}
-        for key, candidates in possible_cols.items():
-            for cand in candidates:
-                if cand in df.columns:
-                    col_map[key] = cand
-                    break
-                # Case-insensitive check
-                matches = [c for c in df.columns if c.lower() == cand.lower()]
-                if matches:
-                    col_map[key] = matches[0]
-                    break
-
-        if "country" not in col_map and "country_alpha" not in col_map:
-            raise ValueError(
-                f"No country column found. Columns: {df.columns.tolist()[:20]}"
-            )
-
-        if "year" not in col_map:
-            raise ValueError(
-                f"No year column found. Columns: {df.columns.tolist()[:20]}"
-            )
+        # Compact group keys: country codes as categories, years as small ints
+        df[country_col] = df[country_col].astype("category")
+        df[year_col] = df[year_col].astype("Int16")
 
         observations = []
 
-        # Use country_alpha if available, else numeric country code
-        country_col = col_map.get("country_alpha", col_map.get("country"))
-        year_col = col_map["year"]
+        # Interpersonal trust (A165): 1=trust, 2=careful, negative=missing
+        # NOTE: EVS is only used for interpersonal trust. Institutional trust
+        # is excluded because EVS has inconsistent variable coverage across
+        # country/years (E069_11 vs E069_13), leading to measurement mismatches.
+        # WVS is the sole source for institutional trust pillar.
+        inter_col = col_map.get("interpersonal")
+        grouped = df.groupby([country_col, year_col], observed=True)
+        cells = grouped.size().index
+        if inter_col:
+            # Count valid and trusting responses per country AND year in one pass
+            codes = pd.to_numeric(df[inter_col], errors="coerce")
+            group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+            n_trusts, n_valids = binary_trust_counts(
+                codes.to_numpy(dtype=np.float64, na_value=np.nan),
+                group_ids,
+                len(cells),
+            )
+        else:
+            n_trusts = n_valids = np.zeros(len(cells), dtype=np.int64)
 
-        # Group by country AND year
-        for (country_code, survey_year), group_df in df.groupby(
-            [country_col, year_col]
+        for (country_code, survey_year), n_valid, n_trust in zip(
+            cells, n_valids, n_trusts
         ):
             survey_year = int(survey_year)
 
@@ -250,37 +301,112 @@ class EVSProcessor(BaseProcessor):
                 self.stats["unmapped_countries"].append(str(country_code))
                 continue
 
-            # Interpersonal trust (A165): 1=trust, 2=careful, negative=missing
-            # NOTE: EVS is only used for interpersonal trust. Institutional trust
-            # is excluded because EVS has inconsistent variable coverage across
-            # country/years (E069_11 vs E069_13), leading to measurement mismatches.
-            # WVS is the sole source for institutional trust pillar.
-            if "interpersonal" in col_map:
-                inter_obs = self._calc_interpersonal(
-                    group_df, col_map["interpersonal"], iso3, survey_year
+            if inter_col and n_valid >= self.MIN_SAMPLE_SIZE:
+                observations.append(
+                    self._interpersonal_observation(
+                        iso3, survey_year, int(n_valid), int(n_trust)
+                    )
                 )
-                if inter_obs:
-                    observations.append(inter_obs)
 
         print(f"Processed {len(observations)} EVS observations")
         return observations
 
-    def _calc_interpersonal(
-        self, df: pd.DataFrame, col: str, iso3: str, year: int
-    ) -> Optional[Observation]:
-        """Calculate interpersonal trust from A165."""
-        if col not in df.columns:
-            return None
+    def _resolve_columns(self, header: pd.Index) -> Dict[str, str]:
+        """
+        Find the actual names of the EVS variables in a file header.
 
-        # Filter valid responses (1=trust, 2=careful)
-        valid = df[col].dropna()
-        valid = valid[valid.isin([1, 2])]
+        Args:
+            header: Column names of the file
 
-        if len(valid) < self.MIN_SAMPLE_SIZE:
-            return None
+        Returns:
+            Mapping of variable key (e.g. "country", "year") to column name
 
-        # % saying "can trust" (code 1)
-        trust_pct = float((valid == 1).mean() * 100)
+        Raises:
+            ValueError: If no country or year column is found
+        """
+        # Exact names first, then a case-insensitive match (first column wins)
+        names = set(header)
+        by_lower: Dict[str, str] = {}
+        for c in header:
+            by_lower.setdefault(c.lower(), c)
+
+        col_map = {}
+        for key, candidates in self.COLUMN_CANDIDATES.items():
+            for cand in candidates:
+                if cand in names:
+                    col_map[key] = cand
+                    break
+                if cand.lower() in by_lower:
+                    col_map[key] = by_lower[cand.lower()]
+                    break
+
+        if "country" not in col_map and "country_alpha" not in col_map:
+            raise ValueError(
+                f"No country column found. Columns: {header.tolist()[:20]}"
+            )
+
+        if "year" not in col_map:
+            raise ValueError(f"No year column found. Columns: {header.tolist()[:20]}")
+
+        return col_map
+
+    def _used_columns(self, col_map: Dict[str, str]) -> List[str]:
+        """
+        List the columns processing reads: country, year, then A165 if present.
+
+        Args:
+            col_map: Resolved columns from _resolve_columns()
+        """
+        # Use country_alpha if available, else numeric country code
+        country_col = col_map.get("country_alpha") or col_map["country"]
+
+        # Only interpersonal trust is used (see _process_trend_file)
+        usecols = [country_col, col_map["year"]]
+        if "interpersonal" in col_map:
+            usecols.append(col_map["interpersonal"])
+
+        return usecols
+
+    def _iter_stata_chunks(
+        self, input_path: Path, columns: List[str]
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read the given columns from a Stata file, chunk by chunk.
+
+        pandas decodes every variable of the rows it reads, so the file is
+        streamed in STATA_CHUNK_SIZE-row chunks and only the projected
+        columns are kept.
+        """
+        with pd.read_stata(
+            str(input_path),
+            columns=columns,
+            convert_categoricals=False,
+            chunksize=self.STATA_CHUNK_SIZE,
+        ) as reader:
+            yield from reader
+
+    def _read_stata_columns(self, input_path: Path, columns: List[str]) -> pd.DataFrame:
+        """Read the given columns from a Stata file into one DataFrame."""
+        chunks = list(self._iter_stata_chunks(input_path, columns))
+        return (
+            pd.concat(chunks, ignore_index=True)
+            if chunks
+            else pd.DataFrame(columns=columns)
+        )
+
+    def _interpersonal_observation(
+        self, iso3: str, year: int, n_valid: int, n_trust: int
+    ) -> Observation:
+        """
+        Build the interpersonal trust observation for one country-year.
+
+        Args:
+            iso3: Country code
+            year: Survey year
+            n_valid: Number of valid A165 responses (1=trust, 2=careful)
+            n_trust: Number of those saying "can trust" (code 1)
+        """
+        trust_pct = n_trust / n_valid * 100
 
         return Observation(
             iso3=iso3,
@@ -290,8 +416,8 @@ class EVSProcessor(BaseProcessor):
             raw_value=round(trust_pct, 1),
             raw_unit="Percent trusting",
             score_0_100=round(trust_pct, 1),
-            sample_n=len(valid),
-            method_notes=f"EVS A165, n={len(valid)}",
+            sample_n=n_valid,
+            method_notes=f"EVS A165, n={n_valid}",
             source_url="https://europeanvaluesstudy.eu/",
             methodology="binary",
         )
@@ -307,17 +433,17 @@ class EVSProcessor(BaseProcessor):
             if col not in df.columns:
                 continue
 
-            # Filter valid responses (1-4), negative values are missing
-            valid = df[col].dropna()
-            valid = valid[valid.isin([1, 2, 3, 4])]
+            # Valid responses are 1-4; NaN and negative (missing) codes fail
+            codes = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            n_valid = int(np.isin(codes, [1, 2, 3, 4]).sum())
 
-            if len(valid) < 100:
+            if n_valid < 100:
                 continue
 
             # Calculate % confident (codes 1 or 2 = "great deal" or "quite a lot")
-            confident_pct = float(((valid == 1) | (valid == 2)).mean() * 100)
-            var_scores.append(confident_pct)
-            total_n = max(total_n, len(valid))
+            n_confident = int(((codes == 1) | (codes == 2)).sum())
+            var_scores.append(n_confident / n_valid * 100)
+            total_n = max(total_n, n_valid)
 
         if not var_scores or total_n < self.MIN_SAMPLE_SIZE:
             return None
@@ -339,18 +465,26 @@ class EVSProcessor(BaseProcessor):
 
     def _get_iso3(self, country_code) -> Optional[str]:
         """Convert EVS country code to ISO3."""
-        # Try numeric lookup (handles int, float, and numeric strings)
-        try:
-            code_int = int(float(country_code))
-            if code_int in EVS_COUNTRY_CODES:
-                return EVS_COUNTRY_CODES[code_int]
-        except (ValueError, TypeError):
-            pass
-
-        # Try string lookup (3-letter codes)
-        code_str = str(country_code)
-        if len(code_str) == 3 and code_str.isalpha():
-            return code_str.upper()
+        if isinstance(country_code, Real):
+            # Numeric column (int or float): look the code up directly
+            code = float(country_code)
+            if math.isfinite(code):
+                iso3 = EVS_COUNTRY_CODES.get(int(code))
+                if iso3:
+                    return iso3
+            code_str = str(country_code)
+        else:
+            # Try string lookup (3-letter codes)
+            code_str = str(country_code)
+            if len(code_str) == 3 and code_str.isalpha():
+                return code_str.upper()
+
+            # Try numeric strings ("752" or "752.0")
+            whole, _, fraction = code_str.strip().partition(".")
+            if whole.isdigit() and (not fraction or fraction.isdigit()):
+                iso3 = EVS_COUNTRY_CODES.get(int(whole))
+                if iso3:
+                    return iso3
 
         # Fallback to country mapper
         return self.country_mapper.get_or_map(code_str)
@@ -401,8 +535,6 @@ def main(year: int, dry_run: bool):
         sys.exit(1)
     except Exception as e:
         print(f"EVS ETL failed: {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
 
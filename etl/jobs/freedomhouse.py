@@ -17,17 +17,31 @@ Status categories: F=Free, PF=Partly Free, NF=Not Free
 """
 
 import sys
+import traceback
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
 import click
 import pandas as pd
 
+try:
+    import pycountry
+except ImportError:
+    pycountry = None
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.base import (
+    OBSERVATION_COLUMNS,
+    BaseProcessor,
+    Observation,
+    observations_from_frame,
+)
+from common.cache import read_cached
+from common.readers import read_excel
 
 # Freedom House country names to ISO3 mapping (for non-standard names)
 FH_COUNTRY_MAP = {
@@ -55,6 +69,9 @@ class FreedomHouseProcessor(BaseProcessor):
 
     SOURCE_NAME = "FreedomHouse"
 
+    # Columns of the FIW13-24 sheet used by process()
+    COLUMNS = ["Country/Territory", "C/T", "Edition", "Status", "Total"]
+
     def download(self, year: int) -> Path:
         """Check for Freedom House data file."""
         data_path: Path = self.raw_data_dir / "freedomhouse.xlsx"
@@ -65,16 +82,18 @@ class FreedomHouseProcessor(BaseProcessor):
             )
         return data_path
 
-    def _get_iso3(self, country_name: str) -> str | None:
-        """Convert country name to ISO3 code."""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_iso3(country_name: str) -> str | None:
+        """Convert country name to ISO3 code (memoized per name)."""
         # Check special mappings first
         if country_name in FH_COUNTRY_MAP:
             return FH_COUNTRY_MAP[country_name]
 
-        # Try pycountry
-        try:
-            import pycountry
+        if pycountry is None:
+            return None
 
+        try:
             # Try exact match
             country = pycountry.countries.get(name=country_name)
             if country:
@@ -93,50 +112,71 @@ class FreedomHouseProcessor(BaseProcessor):
 
     def process(self, data_path: Path, year: int) -> List[Observation]:
         """Process Freedom House Excel data to observations."""
-        observations = []
-
-        df = pd.read_excel(data_path, sheet_name="FIW13-24", header=1)
-
-        for _, row in df.iterrows():
-            country = row.get("Country/Territory")
-            if pd.isna(country):
-                continue
-
-            # Skip territories
-            if row.get("C/T") == "t":
-                continue
-
-            edition = row.get("Edition")
-            if pd.isna(edition):
-                continue
-
-            data_year = int(edition)
-
-            # Get ISO3
-            iso3 = self._get_iso3(str(country))
-            if not iso3:
-                continue
-
-            # Total score (0-100, higher is better)
-            # Skip invalid scores (some countries like Syria have -1)
-            total = row.get("Total")
-            if pd.notna(total) and 0 <= float(total) <= 100:
-                observations.append(
-                    Observation(
-                        iso3=iso3,
-                        year=data_year,
-                        source=self.SOURCE_NAME,
-                        trust_type="freedom",
-                        raw_value=int(total),
-                        raw_unit="score 0-100",
-                        score_0_100=float(total),
-                        sample_n=None,
-                        method_notes=f"Freedom House FIW {data_year}, Status: {row.get('Status', 'N/A')}",
-                        source_url="https://freedomhouse.org/report/freedom-world",
-                    )
-                )
-
-        return observations
+        return observations_from_frame(self.observation_frame(data_path))
+
+    def observation_frame(self, data_path: Path) -> pd.DataFrame:
+        """
+        Process Freedom House Excel data to a frame of observation fields.
+
+        Args:
+            data_path: Path to the Freedom House workbook
+
+        Returns:
+            DataFrame with one column per Observation field and one row per
+            country-edition (see observations_from_frame())
+        """
+        # Reuse the parsed sheet from a previous run while the file is unchanged
+        df = read_cached(
+            data_path,
+            lambda: read_excel(
+                data_path, sheet_name="FIW13-24", header=1, columns=self.COLUMNS
+            ),
+        )
+
+        required = ["Country/Territory", "Edition", "Total"]
+        if any(col not in df.columns for col in required):
+            return pd.DataFrame(columns=OBSERVATION_COLUMNS)
+
+        totals = pd.to_numeric(df["Total"])
+        keep = df["Country/Territory"].notna() & df["Edition"].notna()
+        # Skip territories
+        if "C/T" in df.columns:
+            keep &= df["C/T"].ne("t")
+        # Total score (0-100, higher is better)
+        # Skip invalid scores (some countries like Syria have -1)
+        keep &= totals.between(0, 100)
+
+        df = df.loc[keep]
+        totals = totals[keep]
+        statuses = (
+            df["Status"].fillna("N/A").astype(str)
+            if "Status" in df.columns
+            else pd.Series("N/A", df.index)
+        )
+
+        # Resolve each distinct country name once
+        names = df["Country/Territory"].astype(str)
+        iso3_by_name = {name: self._get_iso3(name) for name in names.unique()}
+        years = df["Edition"].astype(int)
+
+        # Build the observation fields column-wise
+        frame = pd.DataFrame(
+            {
+                "iso3": names.map(iso3_by_name),
+                "year": years,
+                "source": self.SOURCE_NAME,
+                "trust_type": "freedom",
+                "raw_value": totals.astype(int),
+                "raw_unit": "score 0-100",
+                "score_0_100": totals.astype(float),
+                "method_notes": "Freedom House FIW "
+                + years.astype(str)
+                + ", Status: "
+                + statuses,
+                "source_url": "https://freedomhouse.org/report/freedom-world",
+            }
+        )
+        return frame[frame["iso3"].notna()]
 
 
 @click.command()
@@ -150,31 +190,29 @@ def main(year: int, dry_run: bool):
         data_path = processor.download(year or 2024)
         print(f"Processing: {data_path.name}")
 
-        observations = processor.process(data_path, year or 2024)
+        # Summarize and filter the column-wise result; Observation objects
+        # are only built for the rows that get loaded
+        frame = processor.observation_frame(data_path)
 
         # Filter by year if specified
         if year:
-            observations = [o for o in observations if o.year == year]
+            frame = frame[frame["year"] == year]
 
         # Count by year
-        by_year: dict[int, int] = {}
-        for obs in observations:
-            by_year[obs.year] = by_year.get(obs.year, 0) + 1
+        by_year = frame["year"].value_counts()
 
-        print(f"Found {len(observations)} observations")
-        print(f"Years: {sorted(by_year.keys())}")
-        print(f"Countries per year: ~{sum(by_year.values()) // len(by_year)}")
+        print(f"Found {len(frame)} observations")
+        print(f"Years: {sorted(by_year.index.tolist())}")
+        print(f"Countries per year: ~{len(frame) // len(by_year)}")
 
-        if not dry_run and observations:
-            processor.load_to_database(observations)
+        if not dry_run and len(frame):
+            processor.load_to_database(observations_from_frame(frame))
             print("Saved to database")
         elif dry_run:
             print("Dry run - not saved")
 
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
 
@@ -13,17 +13,21 @@ Coverage: USA only, 1972-2024 (biennial/irregular)
 """
 
 import sys
+import traceback
 from pathlib import Path
 from typing import List, Optional
 
 import click
+import numpy as np
 import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from common.agg import binary_trust_counts
 from common.base import BaseProcessor, Observation
+from common.cache import read_cached
 
 
 class GSSProcessor(BaseProcessor):
@@ -32,6 +36,9 @@ class GSSProcessor(BaseProcessor):
     SOURCE_NAME = "GSS"
     MIN_SAMPLE_SIZE = 300
 
+    # Confidence variables averaged into institutional trust
+    INSTITUTIONAL_VARS = ["confed", "conlegis"]
+
     def download(self, year: int) -> Path:
         """Check for GSS data file (manual download required)."""
         gss_dir = self.raw_data_dir / "gss"
@@ -52,31 +59,99 @@ class GSSProcessor(BaseProcessor):
         """Process GSS survey data into observations."""
         print(f"Loading GSS data from {input_path}...")
 
-        df = pd.read_stata(input_path, convert_categoricals=False)
+        # Only read the variables used below; the cumulative file has thousands
+        with pd.read_stata(input_path, iterator=True) as reader:
+            header = set(reader.variable_labels())
+        columns = [
+            var for var in ["year", "trust", *self.INSTITUTIONAL_VARS] if var in header
+        ]
+
+        # Reuse the parsed columns from a previous run while the file is unchanged
+        df = read_cached(
+            input_path,
+            lambda: pd.read_stata(
+                input_path, columns=columns, convert_categoricals=False
+            ),
+            columns=columns,
+        )
         print(f"Loaded {len(df)} survey responses")
 
+        # Group on a compact integer year
+        df["year"] = df["year"].astype("Int16")
+
         observations = []
 
-        # Process each year
-        for survey_year in sorted(df["year"].dropna().unique()):
+        # Per-year counts and score sums, in one grouped pass over all years
+        for survey_year, counts in self._year_counts(df).iterrows():
             survey_year = int(survey_year)
-            subset = df[df["year"] == survey_year]
 
             # Interpersonal trust
-            inter_obs = self._calculate_interpersonal_trust(subset, survey_year)
+            inter_obs = self._calculate_interpersonal_trust(counts, survey_year)
             if inter_obs:
                 observations.append(inter_obs)
 
             # Institutional trust (confed/conlegis available since 1973)
-            inst_obs = self._calculate_institutional_trust(subset, survey_year)
+            inst_obs = self._calculate_institutional_trust(counts, survey_year)
             if inst_obs:
                 observations.append(inst_obs)
 
         print(f"Processed {len(observations)} GSS observations")
         return observations
 
+    def _year_counts(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Count valid responses per survey year.
+
+        Args:
+            df: GSS responses
+
+        Returns:
+            DataFrame indexed by year with "trust_n"/"trust_yes" (valid and
+            "can trust" responses) and, per institutional variable,
+            "<var>_n"/"<var>_score" (valid responses and their summed
+            0-100 scores), for whichever variables the file has
+        """
+        # One sort gives the survey years and each row's year id, so every
+        # count is a bincount over the id rather than a hash groupby
+        has_year = df["year"].notna().to_numpy()
+        years, year_index = np.unique(
+            df["year"][has_year].to_numpy(dtype=np.int64), return_inverse=True
+        )
+        n_years = len(years)
+        year_ids = np.full(len(df), -1, dtype=np.int64)
+        year_ids[has_year] = year_index
+
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(year_ids[mask & has_year], minlength=n_years)
+
+        columns = {}
+
+        if "trust" in df.columns:
+            # Valid answers exclude "depends" (3)
+            n_trust, n_valid = binary_trust_counts(
+                df["trust"].to_numpy(dtype=np.float64, na_value=np.nan),
+                year_ids,
+                n_years,
+            )
+            columns["trust_n"] = n_valid
+            columns["trust_yes"] = n_trust
+
+        for var in self.INSTITUTIONAL_VARS:
+            if var not in df.columns:
+                continue
+            codes = df[var].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = np.isin(codes, [1, 2, 3])
+            columns[f"{var}_n"] = count(valid)
+            # Map to 0-100: 1->100, 2->50, 3->0
+            scores = np.where(valid, (3 - codes) * 50.0, 0.0)
+            columns[f"{var}_score"] = np.bincount(
+                year_index, weights=scores[has_year], minlength=n_years
+            )
+
+        return pd.DataFrame(columns, index=years)
+
     def _calculate_interpersonal_trust(
-        self, df: pd.DataFrame, year: int
+        self, counts: pd.Series, year: int
     ) -> Optional[Observation]:
         """
         Calculate interpersonal trust from 'trust' variable.
@@ -85,17 +160,15 @@ class GSSProcessor(BaseProcessor):
                or that you can't be too careful in dealing with people?"
         1 = Can trust, 2 = Cannot trust, 3 = Depends
         """
-        if "trust" not in df.columns:
+        if "trust_n" not in counts:
             return None
 
-        valid = df["trust"].dropna()
-        valid = valid[valid.isin([1, 2])]  # Exclude "depends"
-
-        if len(valid) < self.MIN_SAMPLE_SIZE:
+        n_valid = int(counts["trust_n"])
+        if n_valid < self.MIN_SAMPLE_SIZE:
             return None
 
         # % saying "can trust"
-        pct_trust = float((valid == 1).mean() * 100)
+        pct_trust = float(counts["trust_yes"] / n_valid * 100)
 
         return Observation(
             iso3="USA",
@@ -105,14 +178,14 @@ class GSSProcessor(BaseProcessor):
             raw_value=round(pct_trust, 1),
             raw_unit="% can trust",
             score_0_100=round(pct_trust, 1),
-            sample_n=int(len(valid)),
-            method_notes=f"GSS trust variable, n={len(valid)}",
+            sample_n=n_valid,
+            method_notes=f"GSS trust variable, n={n_valid}",
             source_url="https://gss.norc.org",
             methodology="binary",
         )
 
     def _calculate_institutional_trust(
-        self, df: pd.DataFrame, year: int
+        self, counts: pd.Series, year: int
     ) -> Optional[Observation]:
         """
         Calculate institutional trust from confed + conlegis.
@@ -121,26 +194,23 @@ class GSSProcessor(BaseProcessor):
         conlegis: Confidence in Congress
         Scale: 1=A great deal, 2=Only some, 3=Hardly any
         """
-        # Map to 0-100: 1->100, 2->50, 3->0
-        score_map = {1: 100, 2: 50, 3: 0}
-
-        scores = []
+        score_sum = 0.0
+        score_n = 0
         total_n = 0
 
-        for var in ["confed", "conlegis"]:
-            if var not in df.columns:
+        for var in self.INSTITUTIONAL_VARS:
+            if f"{var}_n" not in counts:
                 continue
-            valid = df[var].dropna()
-            valid = valid[valid.isin([1, 2, 3])]
-            if len(valid) >= self.MIN_SAMPLE_SIZE:
-                mapped = valid.map(score_map)
-                scores.extend(mapped.tolist())
-                total_n = max(total_n, len(valid))
-
-        if len(scores) < self.MIN_SAMPLE_SIZE:
+            n_valid = int(counts[f"{var}_n"])
+            if n_valid >= self.MIN_SAMPLE_SIZE:
+                score_sum += counts[f"{var}_score"]
+                score_n += n_valid
+                total_n = max(total_n, n_valid)
+
+        if score_n < self.MIN_SAMPLE_SIZE:
             return None
 
-        avg_score = float(sum(scores) / len(scores))
+        avg_score = float(score_sum / score_n)
 
         return Observation(
             iso3="USA",
@@ -189,8 +259,6 @@ def main(year: int, dry_run: bool):
         sys.exit(1)
     except Exception as e:
         print(f"GSS ETL failed: {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
 
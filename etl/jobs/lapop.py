@@ -22,20 +22,34 @@ Coverage: 28+ countries including Caribbean nations
 Years: 2004-2023
 """
 
+import os
 import re
 import sys
+import traceback
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import click
+import numpy as np
 import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.agg import response_codes, scale_trust_counts
+from common.base import (
+    OBSERVATION_COLUMNS,
+    BaseProcessor,
+    Observation,
+    observations_from_frame,
+)
+from common.cache import read_cached
+
+# Survey year in a file or directory name
+YEAR_PATTERN = re.compile(r"(20\d{2})")
 
 # LAPOP country codes to ISO alpha-3
 # Source: LAPOP codebooks - pais variable
@@ -101,6 +115,16 @@ class LAPOPProcessor(BaseProcessor):
     YEAR_VAR = "year"
     WAVE_VAR = "wave"
 
+    # Lower-cased names of every column process() may use
+    READ_COLUMNS = {
+        COUNTRY_VAR,
+        YEAR_VAR,
+        WAVE_VAR,
+        "año",
+        *INTERPERSONAL_VARS,
+        *(var for patterns in INSTITUTIONAL_VARS.values() for var in patterns),
+    }
+
     def download(self, year: int) -> Path:
         """Check for LAPOP data files."""
         lapop_dir = self.raw_data_dir / "lapop"
@@ -124,61 +148,43 @@ class LAPOPProcessor(BaseProcessor):
             "Please download from https://www.vanderbilt.edu/lapop/raw-data.php"
         )
 
-    def _find_column(self, df: pd.DataFrame, patterns: List[str]) -> Optional[str]:
-        """Find a column from a list of patterns (case-insensitive)."""
-        df_cols_lower: dict[str, str] = {c.lower(): c for c in df.columns}
-        for pattern in patterns:
-            if pattern.lower() in df_cols_lower:
-                return df_cols_lower[pattern.lower()]
-        return None
-
-    def _calculate_interpersonal_trust(self, data: pd.Series) -> Optional[float]:
-        """
-        Calculate interpersonal trust percentage from IT1 variable.
-
-        IT1 scale: 1=very trustworthy, 2=somewhat trustworthy,
-                   3=not very trustworthy, 4=untrustworthy
-        Trust = responses 1 or 2 (trustworthy/somewhat trustworthy)
+    def _find_column(
+        self, columns_lower: Dict[str, str], patterns: List[str]
+    ) -> Optional[str]:
         """
-        # Filter valid responses (1-4)
-        valid = data[(data >= 1) & (data <= 4)]
+        Find a column from a list of patterns (case-insensitive).
 
-        if len(valid) < self.MIN_SAMPLE_SIZE:
-            return None
+        Args:
+            columns_lower: Column names keyed by their lower-cased form, built
+                once per DataFrame
+            patterns: Candidate names, in order of preference
 
-        # Trust = 1 or 2
-        trust_pct = (valid <= 2).mean() * 100
-        return float(trust_pct)
-
-    def _calculate_institutional_trust(self, data: pd.Series) -> Optional[float]:
-        """
-        Calculate institutional trust percentage from B-series variables.
-
-        B-series scale: 1=not at all, 7=a lot
-        Trust = responses 5, 6, or 7 (somewhat to a lot)
+        Returns:
+            Name of the first matching column, or None
         """
-        # Filter valid responses (1-7)
-        valid = data[(data >= 1) & (data <= 7)]
-
-        if len(valid) < self.MIN_SAMPLE_SIZE:
-            return None
-
-        # Trust = 5, 6, or 7 (top 3 of 7-point scale)
-        trust_pct = (valid >= 5).mean() * 100
-        return float(trust_pct)
+        for pattern in patterns:
+            if pattern.lower() in columns_lower:
+                return columns_lower[pattern.lower()]
+        return None
 
     def process(self, data_path: Path, year: int) -> List[Observation]:
         """Process LAPOP data to observations."""
-        observations = []
+        # Accumulate results column-wise; Observations are built once at the end
+        results: Dict[str, list] = {name: [] for name in OBSERVATION_COLUMNS}
+
+        def emit(**fields) -> None:
+            for name, values in results.items():
+                values.append(fields.get(name))
 
         # Read data file
         try:
-            if data_path.suffix.lower() == ".sav":
-                import pyreadstat
-
-                df, _ = pyreadstat.read_sav(str(data_path))
-            else:
-                df = pd.read_stata(str(data_path), convert_categoricals=False)
+            columns = self._present_columns(data_path)
+            # Reuse the parsed columns from a previous run while the file is unchanged
+            df = read_cached(
+                data_path,
+                lambda: self._read_columns(data_path, columns),
+                columns=columns,
+            )
         except Exception as e:
             print(f"  Error reading {data_path}: {e}")
             return []
@@ -199,11 +205,12 @@ class LAPOPProcessor(BaseProcessor):
                 break
 
         # Find trust variables
-        interp_col = self._find_column(df, self.INTERPERSONAL_VARS)
+        columns_lower = {c.lower(): c for c in df.columns}
+        interp_col = self._find_column(columns_lower, self.INTERPERSONAL_VARS)
 
         inst_cols = {}
         for inst_type, patterns in self.INSTITUTIONAL_VARS.items():
-            col = self._find_column(df, patterns)
+            col = self._find_column(columns_lower, patterns)
             if col:
                 inst_cols[inst_type] = col
 
@@ -211,83 +218,211 @@ class LAPOPProcessor(BaseProcessor):
             print(f"  No trust variables found in {data_path.name}")
             return []
 
-        # Get unique countries
-        countries = df[self.COUNTRY_VAR].dropna().unique()
-
-        for country_val in countries:
-            # Get ISO3 code
-            try:
-                iso3 = LAPOP_COUNTRY_CODES.get(int(country_val))
-            except (ValueError, TypeError):
-                continue
-
-            if not iso3:
-                continue
-
-            country_data = df[df[self.COUNTRY_VAR] == country_val]
-
-            # If merged file, process by year
-            if year_col:
-                years_in_data = country_data[year_col].dropna().unique()
-                for data_year in years_in_data:
-                    try:
-                        data_year = int(data_year)
-                    except (ValueError, TypeError):
-                        continue
-
-                    if data_year < 2004 or data_year > 2030:
-                        continue
-
-                    year_data = country_data[country_data[year_col] == data_year]
-                    obs = self._process_country_year(
-                        year_data, iso3, data_year, interp_col, inst_cols
-                    )
-                    observations.extend(obs)
-            else:
-                # Single year file
-                obs = self._process_country_year(
-                    country_data, iso3, year, interp_col, inst_cols
-                )
-                observations.extend(obs)
+        # Drop the candidate columns that were not picked
+        used = [self.COUNTRY_VAR, year_col, interp_col, *inst_cols.values()]
+        df = df[[c for c in used if c]]
+
+        # One byte per answer for the counting passes
+        for col in [interp_col, *inst_cols.values()]:
+            if col:
+                df[col] = response_codes(df[col])
+
+        # Country codes as a categorical, with categories in order of first
+        # appearance: the ISO3 lookup runs once per code and the groupby
+        # below works on integer codes instead of hashing every row
+        country = df[self.COUNTRY_VAR]
+        country = country.astype(pd.CategoricalDtype(country.dropna().unique()))
+        countries = country.cat.categories
+
+        # Map country codes to ISO3; unknown or non-numeric codes become NaN
+        # and their rows are dropped
+        iso3_by_country = pd.Series(
+            pd.to_numeric(countries, errors="coerce"), index=countries
+        ).map(LAPOP_COUNTRY_CODES)
+        keep = country.map(iso3_by_country).notna()
+
+        # If merged file, drop rows outside the survey years up front
+        if year_col:
+            years = pd.to_numeric(df[year_col], errors="coerce")
+            keep &= years.between(2004, 2030)
+
+        df = df[keep]
+
+        # Count responses for every country (and survey year, for merged
+        # files) in one grouped pass rather than per group. Countries are
+        # keyed by their LAPOP code, as several codes share an ISO3.
+        keys = [country[keep]]
+        if year_col:
+            keys.append(years[keep])
+        cells = self._response_counts(df, keys, interp_col, inst_cols)
+
+        # Keep country-major order: main() keeps the last observation for an
+        # ISO3 shared by several codes
+        country_order = countries.get_indexer(cells.index.get_level_values(0))
+        cells = cells.iloc[np.argsort(country_order, kind="stable")]
+
+        for code, (key, counts) in zip(
+            cells.index.get_level_values(0), cells.iterrows()
+        ):
+            iso3 = iso3_by_country[code]
+            # If merged file, each cell is one survey year
+            cell_year = int(key[1]) if year_col else year
+
+            self._process_country_year(
+                emit, counts, iso3, cell_year, interp_col, inst_cols
+            )
 
-        return observations
+        return observations_from_frame(pd.DataFrame(results))
+
+    def _present_columns(self, data_path: Path) -> List[str]:
+        """
+        List the columns of a LAPOP file that process() may use.
+
+        Args:
+            data_path: LAPOP .dta or .sav file
+
+        Returns:
+            Names (as in the file) whose lower-cased form is in READ_COLUMNS
+        """
+        try:
+            import pyreadstat
+        except ImportError:
+            if data_path.suffix.lower() == ".sav":
+                raise
+            with pd.read_stata(str(data_path), iterator=True) as reader:
+                names = list(reader.variable_labels())
+        else:
+            read = (
+                pyreadstat.read_sav
+                if data_path.suffix.lower() == ".sav"
+                else pyreadstat.read_dta
+            )
+            _, meta = read(str(data_path), metadataonly=True)
+            names = meta.column_names
+
+        return [c for c in names if c.lower() in self.READ_COLUMNS]
+
+    def _read_columns(self, data_path: Path, columns: List[str]) -> pd.DataFrame:
+        """
+        Read the given columns of a LAPOP file.
+
+        The files carry hundreds of other variables, so only the requested
+        ones are parsed.
+
+        Args:
+            data_path: LAPOP .dta or .sav file
+            columns: Columns to read (from _present_columns())
+
+        Returns:
+            DataFrame with the requested columns
+        """
+        try:
+            import pyreadstat
+        except ImportError:
+            # pandas parses every variable but only converts the kept ones
+            with pd.read_stata(str(data_path), iterator=True) as reader:
+                return reader.read(columns=columns, convert_categoricals=False)
+
+        read = (
+            pyreadstat.read_sav
+            if data_path.suffix.lower() == ".sav"
+            else pyreadstat.read_dta
+        )
+        df, _ = read(str(data_path), usecols=columns)
+        return df
+
+    def _response_counts(
+        self,
+        df: pd.DataFrame,
+        keys: List[pd.Series],
+        interp_col: Optional[str],
+        inst_cols: dict,
+    ) -> pd.DataFrame:
+        """
+        Count valid and trusting responses per group and trust column.
+
+        IT1 scale: 1=very trustworthy, 2=somewhat trustworthy,
+                   3=not very trustworthy, 4=untrustworthy
+        Trust = responses 1 or 2 (trustworthy/somewhat trustworthy)
+
+        B-series scale: 1=not at all, 7=a lot
+        Trust = responses 5, 6, or 7 (somewhat to a lot)
+
+        Args:
+            df: Survey responses
+            keys: Group keys, aligned with df
+            interp_col: Interpersonal trust column, if found
+            inst_cols: Institutional trust columns by type
+
+        Returns:
+            DataFrame indexed by group (in order of first appearance) with
+            the group size in "n" and "<col>_n" (valid) and "<col>_trust"
+            counts per trust column
+        """
+        grouped = df.groupby(keys, observed=True, sort=False)
+        group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        sizes = grouped.size()
+        counts: dict = {"n": sizes.to_numpy()}
+
+        if interp_col:
+            n_trust, n_valid = scale_trust_counts(
+                df[interp_col].to_numpy(),
+                group_ids,
+                len(sizes),
+                valid_range=(1, 4),
+                trust_range=(1, 2),
+            )
+            counts[f"{interp_col}_n"] = n_valid
+            counts[f"{interp_col}_trust"] = n_trust
+
+        if inst_cols:
+            # All B-series columns share a scale, so count them in one pass
+            inst = list(inst_cols.values())
+            n_trust, n_valid = scale_trust_counts(
+                df[inst].to_numpy(),
+                group_ids,
+                len(sizes),
+                valid_range=(1, 7),
+                trust_range=(5, 7),
+            )
+            for i, col in enumerate(inst):
+                counts[f"{col}_n"] = n_valid[:, i]
+                counts[f"{col}_trust"] = n_trust[:, i]
+
+        return pd.DataFrame(counts, index=sizes.index)
 
     def _process_country_year(
         self,
-        data: pd.DataFrame,
+        emit: Callable[..., None],
+        counts: pd.Series,
         iso3: str,
         year: int,
         interp_col: Optional[str],
         inst_cols: dict,
-    ) -> List[Observation]:
-        """Process a single country-year combination."""
-        observations = []
-
-        n = len(data)
+    ) -> None:
+        """Emit observation fields for one country-year from its response counts."""
+        n = int(counts["n"])
         if n < self.MIN_SAMPLE_SIZE:
-            return []
+            return
 
         # Process interpersonal trust
-        if interp_col and interp_col in data.columns:
-            interp_data = data[interp_col].dropna()
-            trust_pct = self._calculate_interpersonal_trust(interp_data)
-
-            if trust_pct is not None:
-                valid_n = len(interp_data[(interp_data >= 1) & (interp_data <= 4)])
-                observations.append(
-                    Observation(
-                        iso3=iso3,
-                        year=int(year),
-                        source=self.SOURCE_NAME,
-                        trust_type="interpersonal",
-                        raw_value=round(trust_pct, 1),
-                        raw_unit="% trustworthy/somewhat trustworthy",
-                        score_0_100=round(trust_pct, 1),
-                        sample_n=int(valid_n),
-                        method_notes=f"LAPOP {year} IT1, n={valid_n}",
-                        source_url="https://www.vanderbilt.edu/lapop",
-                        methodology="4point",
-                    )
+        if interp_col:
+            valid_n = int(counts[f"{interp_col}_n"])
+
+            if valid_n >= self.MIN_SAMPLE_SIZE:
+                trust_pct = int(counts[f"{interp_col}_trust"]) / valid_n * 100
+                emit(
+                    iso3=iso3,
+                    year=int(year),
+                    source=self.SOURCE_NAME,
+                    trust_type="interpersonal",
+                    raw_value=round(trust_pct, 1),
+                    raw_unit="% trustworthy/somewhat trustworthy",
+                    score_0_100=round(trust_pct, 1),
+                    sample_n=int(valid_n),
+                    method_notes=f"LAPOP {year} IT1, n={valid_n}",
+                    source_url="https://www.vanderbilt.edu/lapop",
+                    methodology="4point",
                 )
 
         # Process institutional trust (average of available measures)
@@ -296,45 +431,37 @@ class LAPOPProcessor(BaseProcessor):
         inst_vars_used = []
 
         for inst_type, col in inst_cols.items():
-            if col in data.columns:
-                col_data = data[col].dropna()
-                trust_pct = self._calculate_institutional_trust(col_data)
-
-                if trust_pct is not None:
-                    valid_n = len(col_data[(col_data >= 1) & (col_data <= 7)])
-                    inst_scores.append(trust_pct)
-                    inst_n = max(inst_n, valid_n)
-                    inst_vars_used.append(col)
+            valid_n = int(counts[f"{col}_n"])
 
+            if valid_n >= self.MIN_SAMPLE_SIZE:
+                inst_scores.append(int(counts[f"{col}_trust"]) / valid_n * 100)
+                inst_n = max(inst_n, valid_n)
+                inst_vars_used.append(col)
         if inst_scores:
             avg_inst = sum(inst_scores) / len(inst_scores)
-            observations.append(
-                Observation(
-                    iso3=iso3,
-                    year=int(year),
-                    source=self.SOURCE_NAME,
-                    trust_type="institutional",
-                    raw_value=round(avg_inst, 1),
-                    raw_unit="% trust (5-7 on 7-point scale)",
-                    score_0_100=round(avg_inst, 1),
-                    sample_n=int(inst_n),
-                    method_notes=f"LAPOP {year} {'/'.join(inst_vars_used)} avg, n={inst_n}",
-                    source_url="https://www.vanderbilt.edu/lapop",
-                )
+            emit(
+                iso3=iso3,
+                year=int(year),
+                source=self.SOURCE_NAME,
+                trust_type="institutional",
+                raw_value=round(avg_inst, 1),
+                raw_unit="% trust (5-7 on 7-point scale)",
+                score_0_100=round(avg_inst, 1),
+                sample_n=int(inst_n),
+                method_notes=f"LAPOP {year} {'/'.join(inst_vars_used)} avg, n={inst_n}",
+                source_url="https://www.vanderbilt.edu/lapop",
             )
 
-        return observations
-
 
 def find_year_from_path(data_path: Path) -> Optional[int]:
     """Extract year from file path or filename."""
-    match = re.search(r"(20\d{2})", data_path.name)
+    match = YEAR_PATTERN.search(data_path.name)
     if match:
         year = int(match.group(1))
         if 2004 <= year <= 2030:
             return year
     for parent in data_path.parents:
-        match = re.search(r"(20\d{2})", parent.name)
+        match = YEAR_PATTERN.search(parent.name)
         if match:
             year = int(match.group(1))
             if 2004 <= year <= 2030:
@@ -342,6 +469,23 @@ def find_year_from_path(data_path: Path) -> Optional[int]:
     return None
 
 
+def _process_file(data_path: Path, year: int) -> List[Observation]:
+    """
+    Process one LAPOP file in a worker process.
+
+    Builds its own processor so nothing needs to be pickled on the way in.
+
+    Returns:
+        Observations from the file (empty on error)
+    """
+    try:
+        return LAPOPProcessor().process(data_path, year)
+    except Exception as e:
+        print(f"  Error processing {data_path.name}: {e}")
+        traceback.print_exc()
+        return []
+
+
 @click.command()
 @click.option("--year", type=int, default=None, help="Specific year to process")
 @click.option("--dry-run", is_flag=True, help="Don't save to database")
@@ -366,19 +510,23 @@ def main(year: int, dry_run: bool):
         print("Please download from https://www.vanderbilt.edu/lapop/raw-data.php")
         sys.exit(1)
 
-    all_observations = []
+    # Determine year from filename if single-year file
+    data_files = sorted(data_files)
+    process_years = [year or find_year_from_path(p) or 2023 for p in data_files]
 
-    # Process all data files
-    for data_path in sorted(data_files):
-        print(f"Processing: {data_path.name}")
+    # Deduplicate by (iso3, year, source, trust_type) as results arrive
+    seen: Dict[Tuple[str, int, str, str], Observation] = {}
+    n_collected = 0
 
-        # Determine year from filename if single-year file
-        file_year = find_year_from_path(data_path)
-        process_year = year or file_year or 2023
+    # Each file is an independent parse, so run them in parallel. map() keeps
+    # file order, so later files win the dedup.
+    workers = min(len(data_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = ex.map(_process_file, data_files, process_years)
 
-        try:
-            observations = processor.process(data_path, process_year)
-            all_observations.extend(observations)
+        for data_path, observations in zip(data_files, results):
+            print(f"Processed: {data_path.name}")
+            n_collected += len(observations)
 
             # Count by country and type
             by_country: dict[str, dict[str, int]] = defaultdict(
@@ -386,6 +534,7 @@ def main(year: int, dry_run: bool):
             )
             for obs in observations:
                 by_country[obs.iso3][obs.trust_type] += 1
+                seen[(obs.iso3, obs.year, obs.source, obs.trust_type)] = obs
 
             if by_country:
                 countries_found = list(by_country.keys())
@@ -393,22 +542,9 @@ def main(year: int, dry_run: bool):
                     f"  Found {len(countries_found)} country(s): {', '.join(countries_found)}"
                 )
 
-        except Exception as e:
-            print(f"  Error: {e}")
-            import traceback
-
-            traceback.print_exc()
-
-    # Deduplicate by (iso3, year, source, trust_type)
-    seen = {}
-    for obs in all_observations:
-        key = (obs.iso3, obs.year, obs.source, obs.trust_type)
-        seen[key] = obs
     deduped = list(seen.values())
 
-    print(
-        f"\nTotal: {len(deduped)} observations (deduped from {len(all_observations)})"
-    )
+    print(f"\nTotal: {len(deduped)} observations (deduped from {n_collected})")
 
     # Show Caribbean coverage
     caribbean_obs = [
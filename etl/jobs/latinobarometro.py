@@ -14,19 +14,33 @@ Trust Variables (vary significantly by year):
 Country identification: idenpa or pais (ISO numeric codes)
 """
 
+import os
+import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import click
+import numpy as np
 import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from common.base import BaseProcessor, Observation
+from common.agg import response_codes
+from common.base import (
+    OBSERVATION_COLUMNS,
+    BaseProcessor,
+    Observation,
+    observations_from_frame,
+)
+from common.cache import read_cached
+
+# Survey year in a file or directory name
+YEAR_PATTERN = re.compile(r"(\d{4})")
 
 # ISO numeric codes to ISO alpha-3 for Latin American countries
 LATINO_COUNTRY_CODES = {
@@ -99,6 +113,13 @@ class LatinobarometroProcessor(BaseProcessor):
 
     COUNTRY_VARS = ["idenpa", "pais"]
 
+    # Lower-cased names of every column process() may use
+    READ_COLUMNS = {
+        *COUNTRY_VARS,
+        *INTERPERSONAL_VAR_PATTERNS,
+        *INSTITUTIONAL_VAR_PATTERNS,
+    }
+
     def download(self, year: int) -> Path:
         """Check for Latinobarómetro data files."""
         latino_dir = self.raw_data_dir / "latinobarometro"
@@ -112,112 +133,148 @@ class LatinobarometroProcessor(BaseProcessor):
             "Please download from https://www.latinobarometro.org/"
         )
 
-    def _find_column(self, df: pd.DataFrame, patterns: List[str]) -> Optional[str]:
-        """Find a column from a list of patterns (case-insensitive)."""
-        df_cols_lower: dict[str, str] = {c.lower(): c for c in df.columns}
+    def _find_column(
+        self, columns_lower: Dict[str, str], patterns: List[str]
+    ) -> Optional[str]:
+        """
+        Find a column from a list of patterns (case-insensitive).
+
+        Args:
+            columns_lower: Column names keyed by their lower-cased form, built
+                once per DataFrame
+            patterns: Candidate names, in order of preference
+
+        Returns:
+            Name of the first matching column, or None
+        """
         for pattern in patterns:
-            if pattern.lower() in df_cols_lower:
-                return df_cols_lower[pattern.lower()]
+            if pattern.lower() in columns_lower:
+                return columns_lower[pattern.lower()]
         return None
 
-    def _detect_trust_scale(self, data: pd.Series) -> Tuple[str, float, float]:
+    def _trust_percentage(self, values: np.ndarray) -> Tuple[str, Optional[float], int]:
         """
-        Detect the scale of a trust variable and return (scale_type, min_valid, max_valid).
+        Detect the scale of a trust variable and calculate the trust percentage.
+
+        The scale is taken from the largest positive answer (negative codes
+        are typically missing):
+        - binary (1-2): 1=trust, 2=careful → count 1s
+        - ternary (1-3): 1=trust, 2=careful, 3=depends → count 1s
+        - quaternary (1-4): 1-2=trust, 3-4=no trust → count 1-2s
+        Larger answers mean a different question; the scale is "unknown".
+
+        For institutional trust only the quaternary scale is used:
+        1-2=trust (a lot/some), 3-4=no trust.
+
+        Args:
+            values: Answer codes from response_codes() (-1 for missing)
 
         Returns:
-            scale_type: "binary" (1-2), "ternary" (1-3), "quaternary" (1-4)
-            min_valid: minimum valid value
-            max_valid: maximum valid value
+            Tuple of (scale type, trust percentage or None below
+            MIN_SAMPLE_SIZE or for an unknown scale, number of valid answers)
         """
-        # Filter to positive values only (negative are typically missing codes)
-        valid = data[data > 0]
-        if len(valid) == 0:
-            return "unknown", 1, 2
+        # Codes are whole numbers, so once the scale is known every positive
+        # answer is valid and one filter serves both steps
+        valid = values[values > 0]
+        n_valid = len(valid)
+        if n_valid == 0:
+            return "unknown", None, 0
 
         max_val = valid.max()
 
         if max_val <= 2:
-            return "binary", 1, 2
+            scale_type = "binary"
         elif max_val <= 3:
-            return "ternary", 1, 3
+            scale_type = "ternary"
         elif max_val <= 4:
-            return "quaternary", 1, 4
+            scale_type = "quaternary"
         else:
             # Likely a different question with larger scale
-            return "unknown", 1, 2
+            return "unknown", None, n_valid
 
-    def _calculate_trust_percentage(
-        self, data: pd.Series, scale_type: str, min_val: float, max_val: float
-    ) -> Optional[float]:
-        """
-        Calculate trust percentage based on scale type.
-
-        For interpersonal trust:
-        - binary (1-2): 1=trust, 2=careful → count 1s
-        - ternary (1-3): 1=trust, 2=careful, 3=depends → count 1s
-        - quaternary (1-4): 1-2=trust, 3-4=no trust → count 1-2s
+        if n_valid < self.MIN_SAMPLE_SIZE:
+            return scale_type, None, n_valid
 
-        For institutional trust:
-        - quaternary (1-4): 1-2=trust (a lot/some), 3-4=no trust → count 1-2s
-        """
-        # Filter to valid range
-        valid = data[(data >= min_val) & (data <= max_val)]
-
-        if len(valid) < self.MIN_SAMPLE_SIZE:
-            return None
-
-        if scale_type in ("binary", "ternary"):
-            # Trust = value 1
-            trust_pct = (valid == 1).mean() * 100
-        elif scale_type == "quaternary":
+        if scale_type == "quaternary":
             # Trust = values 1 or 2
-            trust_pct = (valid <= 2).mean() * 100
+            n_trust = int((valid <= 2).sum())
         else:
-            return None
+            # Trust = value 1
+            n_trust = int((valid == 1).sum())
 
-        return float(trust_pct)
+        return scale_type, n_trust / n_valid * 100, n_valid
 
     def process(self, data_path: Path, year: int) -> List[Observation]:
         """Process Latinobarómetro data to observations."""
-        observations = []
+        # Accumulate results column-wise; Observations are built once at the end
+        results: Dict[str, list] = {name: [] for name in OBSERVATION_COLUMNS}
+
+        def emit(**fields) -> None:
+            for name, values in results.items():
+                values.append(fields.get(name))
 
         # Read data file
         try:
-            df = pd.read_stata(str(data_path), convert_categoricals=False)
+            columns = self._present_columns(data_path)
+            # Reuse the parsed columns from a previous run while the file is unchanged
+            df = read_cached(
+                data_path,
+                lambda: self._read_columns(data_path, columns),
+                columns=columns,
+            )
         except Exception as e:
             print(f"  Error reading {data_path}: {e}")
             return []
 
         # Find country column
-        country_col = self._find_column(df, self.COUNTRY_VARS)
+        columns_lower = {c.lower(): c for c in df.columns}
+        country_col = self._find_column(columns_lower, self.COUNTRY_VARS)
         if not country_col:
             print(f"  Country column not found in {data_path.name}")
             return []
 
         # Find trust variables
-        interp_col = self._find_column(df, self.INTERPERSONAL_VAR_PATTERNS)
+        interp_col = self._find_column(columns_lower, self.INTERPERSONAL_VAR_PATTERNS)
         inst_cols = []
         for pattern in self.INSTITUTIONAL_VAR_PATTERNS:
-            col = self._find_column(df, [pattern])
+            col = self._find_column(columns_lower, [pattern])
             if col and col not in inst_cols:
                 inst_cols.append(col)
                 if len(inst_cols) >= 2:  # Only need 2 for averaging
                     break
 
-        # Get unique countries
-        countries = df[country_col].dropna().unique()
-
-        for country_val in countries:
-            # Get ISO3 code
-            try:
-                iso3 = LATINO_COUNTRY_CODES.get(int(country_val))
-            except (ValueError, TypeError):
-                continue
-
-            if not iso3:
-                continue
+        # Drop the candidate columns that were not picked
+        used = [country_col, interp_col, *inst_cols]
+        df = df[[c for c in used if c]]
+
+        # One byte per answer for the per-country passes
+        for col in [interp_col, *inst_cols]:
+            if col:
+                df[col] = response_codes(df[col])
+
+        # Map country codes to ISO3 once per distinct code rather than per
+        # row; unknown or non-numeric codes become NaN and their rows are
+        # dropped. The result is categorical, so the groupby below works on
+        # integer codes.
+        country = df[country_col]
+        country = country.astype(pd.CategoricalDtype(country.dropna().unique()))
+        countries = country.cat.categories
+        iso3_codes, iso3_names = pd.factorize(
+            pd.to_numeric(countries.to_series(), errors="coerce").map(
+                LATINO_COUNTRY_CODES
+            )
+        )
+        # Missing codes are -1, which picks the appended -1 (no ISO3)
+        row_iso3_codes = np.append(iso3_codes, -1)[country.cat.codes.to_numpy()]
+        iso3s = pd.Series(
+            pd.Categorical.from_codes(row_iso3_codes, categories=iso3_names),
+            index=df.index,
+        )
+        mapped = iso3s.notna()
+        df = df[mapped]
 
-            country_data = df[df[country_col] == country_val]
+        # Visit each country's responses once
+        for iso3, country_data in df.groupby(iso3s[mapped], observed=True, sort=False):
             n = len(country_data)
 
             if n < self.MIN_SAMPLE_SIZE:
@@ -225,86 +282,111 @@ class LatinobarometroProcessor(BaseProcessor):
 
             # Process interpersonal trust
             if interp_col:
-                interp_data = country_data[interp_col].dropna()
-                scale_type, min_val, max_val = self._detect_trust_scale(interp_data)
+                scale_type, trust_pct, valid_count = self._trust_percentage(
+                    country_data[interp_col].to_numpy()
+                )
 
-                if scale_type != "unknown":
-                    trust_pct = self._calculate_trust_percentage(
-                        interp_data, scale_type, min_val, max_val
+                if trust_pct is not None:
+                    emit(
+                        iso3=iso3,
+                        year=int(year),
+                        source=self.SOURCE_NAME,
+                        trust_type="interpersonal",
+                        raw_value=round(trust_pct, 1),
+                        raw_unit="% most people can be trusted",
+                        score_0_100=round(trust_pct, 1),
+                        sample_n=int(valid_count),
+                        method_notes=f"Latinobarómetro {year} {interp_col} ({scale_type}), n={valid_count}",
+                        source_url="https://www.latinobarometro.org",
+                        methodology="4point",
                     )
-                    if trust_pct is not None:
-                        valid_count = len(
-                            interp_data[
-                                (interp_data >= min_val) & (interp_data <= max_val)
-                            ]
-                        )
-                        observations.append(
-                            Observation(
-                                iso3=iso3,
-                                year=int(year),
-                                source=self.SOURCE_NAME,
-                                trust_type="interpersonal",
-                                raw_value=round(trust_pct, 1),
-                                raw_unit="% most people can be trusted",
-                                score_0_100=round(trust_pct, 1),
-                                sample_n=int(valid_count),
-                                method_notes=f"Latinobarómetro {year} {interp_col} ({scale_type}), n={valid_count}",
-                                source_url="https://www.latinobarometro.org",
-                                methodology="4point",
-                            )
-                        )
 
             # Process institutional trust
             inst_scores = []
             inst_n = 0
             for col in inst_cols:
-                col_data = country_data[col].dropna()
-                scale_type, min_val, max_val = self._detect_trust_scale(col_data)
+                scale_type, trust_pct, valid_count = self._trust_percentage(
+                    country_data[col].to_numpy()
+                )
 
-                if scale_type == "quaternary":
-                    trust_pct = self._calculate_trust_percentage(
-                        col_data, scale_type, min_val, max_val
-                    )
-                    if trust_pct is not None:
-                        valid_count = len(
-                            col_data[(col_data >= min_val) & (col_data <= max_val)]
-                        )
-                        inst_scores.append(trust_pct)
-                        inst_n = max(inst_n, valid_count)
+                if scale_type == "quaternary" and trust_pct is not None:
+                    inst_scores.append(trust_pct)
+                    inst_n = max(inst_n, valid_count)
 
             if inst_scores:
                 avg_inst = sum(inst_scores) / len(inst_scores)
-                observations.append(
-                    Observation(
-                        iso3=iso3,
-                        year=int(year),
-                        source=self.SOURCE_NAME,
-                        trust_type="institutional",
-                        raw_value=round(avg_inst, 1),
-                        raw_unit="% trust a lot/some",
-                        score_0_100=round(avg_inst, 1),
-                        sample_n=int(inst_n),
-                        method_notes=f"Latinobarómetro {year} institutional avg, n={inst_n}",
-                        source_url="https://www.latinobarometro.org",
-                    )
+                emit(
+                    iso3=iso3,
+                    year=int(year),
+                    source=self.SOURCE_NAME,
+                    trust_type="institutional",
+                    raw_value=round(avg_inst, 1),
+                    raw_unit="% trust a lot/some",
+                    score_0_100=round(avg_inst, 1),
+                    sample_n=int(inst_n),
+                    method_notes=f"Latinobarómetro {year} institutional avg, n={inst_n}",
+                    source_url="https://www.latinobarometro.org",
                 )
 
-        return observations
+        return observations_from_frame(pd.DataFrame(results))
+
+    def _present_columns(self, data_path: Path) -> List[str]:
+        """
+        List the columns of a Latinobarómetro file that process() may use.
+
+        Args:
+            data_path: Latinobarómetro .dta file
+
+        Returns:
+            Names (as in the file) whose lower-cased form is in READ_COLUMNS
+        """
+        try:
+            import pyreadstat
+        except ImportError:
+            with pd.read_stata(str(data_path), iterator=True) as reader:
+                names = list(reader.variable_labels())
+        else:
+            _, meta = pyreadstat.read_dta(str(data_path), metadataonly=True)
+            names = meta.column_names
+
+        return [c for c in names if c.lower() in self.READ_COLUMNS]
+
+    def _read_columns(self, data_path: Path, columns: List[str]) -> pd.DataFrame:
+        """
+        Read the given columns of a Latinobarómetro file.
+
+        pyreadstat parses only the requested variables and skips value labels;
+        pandas is the fallback when it is not installed.
+
+        Args:
+            data_path: Latinobarómetro .dta file
+            columns: Columns to read (from _present_columns())
+
+        Returns:
+            DataFrame with the requested columns, as numeric codes
+        """
+        try:
+            import pyreadstat
+        except ImportError:
+            return pd.read_stata(
+                str(data_path), columns=columns, convert_categoricals=False
+            )
+
+        df, _ = pyreadstat.read_dta(str(data_path), usecols=columns)
+        return df
 
 
 def find_year_from_path(data_path: Path) -> Optional[int]:
     """Extract year from file path or filename."""
-    import re
-
     # Try filename first
-    match = re.search(r"(\d{4})", data_path.name)
+    match = YEAR_PATTERN.search(data_path.name)
     if match:
         year = int(match.group(1))
         if 1995 <= year <= 2030:
             return year
     # Try parent directory
     for parent in data_path.parents:
-        match = re.search(r"(\d{4})", parent.name)
+        match = YEAR_PATTERN.search(parent.name)
         if match:
             year = int(match.group(1))
             if 1995 <= year <= 2030:
@@ -312,6 +394,22 @@ def find_year_from_path(data_path: Path) -> Optional[int]:
     return None
 
 
+def _process_file(data_path: Path, year: int) -> List[Observation]:
+    """
+    Process one Latinobarómetro file in a worker process.
+
+    Builds its own processor so nothing needs to be pickled on the way in.
+
+    Returns:
+        Observations from the file (empty on error)
+    """
+    try:
+        return LatinobarometroProcessor().process(data_path, year)
+    except Exception as e:
+        print(f"  Error processing {data_path.name}: {e}")
+        return []
+
+
 @click.command()
 @click.option("--year", type=int, default=None, help="Specific year to process")
 @click.option("--dry-run", is_flag=True, help="Don't save to database")
@@ -343,38 +441,37 @@ def main(year: int, dry_run: bool):
             else:
                 files_by_year[file_year] = data_path
 
-    all_observations = []
+    jobs = [
+        (file_year, data_path)
+        for file_year, data_path in sorted(files_by_year.items())
+        if not year or file_year == year
+    ]
 
-    for file_year, data_path in sorted(files_by_year.items()):
-        if year and file_year != year:
-            continue
+    # Deduplicate by (iso3, year, source, trust_type) as results arrive
+    seen: Dict[Tuple[str, int, str, str], Observation] = {}
+    n_collected = 0
 
-        print(f"Processing {file_year}: {data_path.name}")
+    # Each survey year is an independent parse, so run them in parallel.
+    # map() keeps year order, so later years win the dedup.
+    workers = min(len(jobs), os.cpu_count() or 1) or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = ex.map(_process_file, [p for _, p in jobs], [y for y, _ in jobs])
 
-        try:
-            observations = processor.process(data_path, file_year)
-            all_observations.extend(observations)
+        for (file_year, data_path), observations in zip(jobs, results):
+            print(f"Processed {file_year}: {data_path.name}")
+            n_collected += len(observations)
 
             by_type: dict[str, int] = defaultdict(int)
             for obs in observations:
                 by_type[obs.trust_type] += 1
+                seen[(obs.iso3, obs.year, obs.source, obs.trust_type)] = obs
 
             for t, count in by_type.items():
                 print(f"  {t}: {count} countries")
-        except Exception as e:
-            print(f"  Error: {e}")
-            continue
-
-    # Deduplicate
-    seen = {}
-    for obs in all_observations:
-        key = (obs.iso3, obs.year, obs.source, obs.trust_type)
-        seen[key] = obs
+
     deduped = list(seen.values())
 
-    print(
-        f"\nTotal: {len(deduped)} observations (deduped from {len(all_observations)})"
-    )
+    print(f"\nTotal: {len(deduped)} observations (deduped from {n_collected})")
 
     if not dry_run and deduped:
         processor.load_to_database(deduped)
@@ -26,6 +26,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from common.base import BaseProcessor, Observation
+from common.readers import read_csv
 
 # LiTS country name to ISO3 mapping
 LITS_COUNTRY_MAP = {
@@ -77,6 +78,12 @@ TRUST_VALUE_MAP = {
     "Complete trust": 5,
 }
 
+# Answer texts as categories in scale order, so a categorical cast yields
+# the 1-5 value as category code + 1
+TRUST_CATEGORIES = pd.CategoricalDtype(
+    sorted(TRUST_VALUE_MAP, key=TRUST_VALUE_MAP.__getitem__)
+)
+
 
 # Trust scale: 1=Complete distrust, 5=Complete trust
 # Convert to 0-100 scale: (value - 1) / 4 * 100
@@ -85,11 +92,31 @@ def scale_1_5_to_100(value):
     return (value - 1) / 4 * 100
 
 
+def to_numeric(series: pd.Series) -> pd.Series:
+    """
+    Convert text trust values to numeric 1-5 scale.
+
+    Args:
+        series: Answer texts (object or categorical)
+
+    Returns:
+        Float Series of 1-5 values, NaN for other answers
+    """
+    codes = series.astype(TRUST_CATEGORIES).cat.codes
+    return (codes + 1).where(codes >= 0)
+
+
 class LiTSProcessor(BaseProcessor):
     """Processor for LiTS data."""
 
     SOURCE_NAME = "LiTS"
 
+    # Trust columns used from the (very wide) survey file
+    INTERPERSONAL_COL = "q402"  # People can be trusted
+    KEY_INST_COLS = ["q403b", "q403e", "q403f"]  # Government, Parliament, Courts
+    FINANCIAL_COL = "q403j"  # Banks/financial system
+    COLUMNS = ["country", INTERPERSONAL_COL, *KEY_INST_COLS, FINANCIAL_COL]
+
     def download(self, year: int) -> Path:
         """Check for LiTS data file."""
         lits_dir = self.raw_data_dir / "lits"
@@ -107,16 +134,15 @@ class LiTSProcessor(BaseProcessor):
         """Process LiTS CSV data to observations."""
         observations = []
 
-        # Read CSV with low_memory=False to handle mixed types
+        # Parse only the used columns of the wide file
         print(f"Reading {data_path.name}...")
-        df = pd.read_csv(data_path, low_memory=False)
+        df = read_csv(data_path, columns=self.COLUMNS)
         print(f"Loaded {len(df)} responses")
 
         # LiTS IV was conducted in 2022-2023
         data_year = 2023
 
         # Columns of interest
-        interpersonal_col = "q402"  # People can be trusted
         _institutional_cols = {  # Reserved for future institutional trust extraction
             "q403a": "Presidency",
             "q403b": "Government/Cabinet",
@@ -134,30 +160,38 @@ class LiTSProcessor(BaseProcessor):
             "q403n": "Public health authorities",
         }
 
-        # Convert text trust values to numeric
-        def to_numeric(series):
-            """Convert text trust values to numeric 1-5 scale."""
-            return series.map(TRUST_VALUE_MAP)
+        # Trust columns present in this file
+        trust_cols = [col for col in self.COLUMNS[1:] if col in df.columns]
+
+        # Keep respondents from known countries and convert every trust column
+        # once for the whole file; unmapped answers become NaN
+        df = df[df["country"].isin(LITS_COUNTRY_MAP)]
+        values = pd.DataFrame(
+            {col: to_numeric(df[col]) for col in trust_cols}, index=df.index
+        )
+
+        # Mean and valid count of every trust column per country in one
+        # grouped pass instead of one scan per country and column
+        grouped = values.groupby(df["country"].astype("category"), observed=True)
+        means = grouped.mean()
+        valid_counts = grouped.count()
+        sample_sizes = grouped.size()
 
         # Process by country
         for country_name, iso3 in LITS_COUNTRY_MAP.items():
-            # Filter to this country
-            country_df = df[df["country"] == country_name]
-
-            if len(country_df) == 0:
+            if country_name not in sample_sizes.index:
                 continue
 
-            sample_n = len(country_df)
+            sample_n = int(sample_sizes[country_name])
+            country_means = means.loc[country_name]
+            country_counts = valid_counts.loc[country_name]
 
             # Interpersonal trust (q402)
-            if interpersonal_col in df.columns:
-                trust_values = to_numeric(country_df[interpersonal_col])
-                # Filter valid responses (1-5)
-                valid_trust = trust_values.dropna()
-                valid_trust = valid_trust[(valid_trust >= 1) & (valid_trust <= 5)]
-
-                if len(valid_trust) >= 50:  # Minimum sample size
-                    mean_trust = float(valid_trust.mean())
+            if self.INTERPERSONAL_COL in trust_cols:
+                n_valid = int(country_counts[self.INTERPERSONAL_COL])
+
+                if n_valid >= 50:  # Minimum sample size
+                    mean_trust = float(country_means[self.INTERPERSONAL_COL])
                     score_100 = float(scale_1_5_to_100(mean_trust))
 
                     observations.append(
@@ -169,7 +203,7 @@ class LiTSProcessor(BaseProcessor):
                             raw_value=round(mean_trust, 2),
                             raw_unit="mean 1-5 scale",
                             score_0_100=round(score_100, 1),
-                            sample_n=int(len(valid_trust)),
+                            sample_n=n_valid,
                             method_notes="LiTS IV (2022-23), Q402: People can be trusted",
                             source_url="https://www.ebrd.com/what-we-do/economic-research-and-data/data/lits.html",
                             methodology="4point",
@@ -178,20 +212,11 @@ class LiTSProcessor(BaseProcessor):
 
             # Institutional trust - composite of key government institutions
             # Average of government, parliament, courts
-            key_inst_cols = [
-                "q403b",
-                "q403e",
-                "q403f",
-            ]  # Government, Parliament, Courts
-            inst_values = []
-
-            for col in key_inst_cols:
-                if col in df.columns:
-                    col_vals = to_numeric(country_df[col])
-                    valid = col_vals.dropna()
-                    valid = valid[(valid >= 1) & (valid <= 5)]
-                    if len(valid) >= 50:
-                        inst_values.append(valid.mean())
+            inst_values = [
+                country_means[col]
+                for col in self.KEY_INST_COLS
+                if col in trust_cols and country_counts[col] >= 50
+            ]
 
             if len(inst_values) >= 2:  # Need at least 2 of 3 institutions
                 mean_inst = float(np.mean(inst_values))
@@ -206,21 +231,18 @@ class LiTSProcessor(BaseProcessor):
                         raw_value=round(mean_inst, 2),
                         raw_unit="mean 1-5 scale",
                         score_0_100=round(score_100, 1),
-                        sample_n=int(sample_n),
+                        sample_n=sample_n,
                         method_notes="LiTS IV (2022-23), Average of Q403b,e,f (govt/parliament/courts)",
                         source_url="https://www.ebrd.com/what-we-do/economic-research-and-data/data/lits.html",
                     )
                 )
 
             # Financial trust (q403j: Banks/financial system)
-            financial_col = "q403j"
-            if financial_col in df.columns:
-                fin_values = to_numeric(country_df[financial_col])
-                valid_fin = fin_values.dropna()
-                valid_fin = valid_fin[(valid_fin >= 1) & (valid_fin <= 5)]
-
-                if len(valid_fin) >= 50:  # Minimum sample size
-                    mean_fin = float(valid_fin.mean())
+            if self.FINANCIAL_COL in trust_cols:
+                n_valid = int(country_counts[self.FINANCIAL_COL])
+
+                if n_valid >= 50:  # Minimum sample size
+                    mean_fin = float(country_means[self.FINANCIAL_COL])
                     score_100 = float(scale_1_5_to_100(mean_fin))
 
                     observations.append(
@@ -232,7 +254,7 @@ class LiTSProcessor(BaseProcessor):
                             raw_value=round(mean_fin, 2),
                             raw_unit="mean 1-5 scale",
                             score_0_100=round(score_100, 1),
-                            sample_n=int(len(valid_fin)),
+                            sample_n=n_valid,
                             method_notes="LiTS IV (2022-23), Q403j: Banks/financial system",
                             source_url="https://www.ebrd.com/what-we-do/economic-research-and-data/data/lits.html",
                         )
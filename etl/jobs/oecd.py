@@ -162,10 +162,12 @@ class OECDProcessor(BaseProcessor):
 
         # Filter for requested year if year column exists
         if year_col:
-            df = df[df[year_col] == year]
+            # Keep the parsed file; the closest-year fallback filters it again
+            all_years = df
+            df = all_years[all_years[year_col] == year]
             if df.empty:
                 # Try closest available year
-                available_years = pd.read_csv(input_path)[year_col].unique()
+                available_years = all_years[year_col].unique()
                 print(f"No data for {year}. Available years: {sorted(available_years)}")
                 # Use most recent year if requested year not available
                 closest_year = (
@@ -173,46 +175,48 @@ class OECDProcessor(BaseProcessor):
                     if any(y <= year for y in available_years)
                     else min(available_years)
                 )
-                df = pd.read_csv(input_path)
-                df = df[df[year_col] == closest_year]
+                df = all_years[all_years[year_col] == closest_year]
                 print(f"Using closest year: {closest_year}")
 
-        for _, row in df.iterrows():
-            country_code = row[country_col]
-
-            # OECD uses ISO3 codes (AUS, AUT, etc.)
-            iso3 = self.country_mapper.get_or_map(str(country_code))
-
-            if not iso3:
-                self.stats["unmapped_countries"].append(str(country_code))
-                continue
-
-            value = row[value_col]
-            if pd.isna(value):
-                continue
-
-            # OECD trust data is percentage (0-100)
-            score = float(value)
-
-            # Validate range
-            if score < 0 or score > 100:
-                self.stats["warnings"].append(
-                    f"OECD score {score} for {iso3} outside expected range"
-                )
-                continue
+        # OECD uses ISO3 codes (AUS, AUT, etc.); map each distinct code once
+        codes = df[country_col].astype(str)
+        iso3_by_code = {
+            code: self.country_mapper.get_or_map(code) or None
+            for code in codes.unique()
+        }
+        iso3s = codes.map(iso3_by_code)
+        mapped = iso3s.notna()
+        self.stats["unmapped_countries"].extend(codes[~mapped].tolist())
+
+        # OECD trust data is percentage (0-100)
+        scores = df[value_col].astype(float)
+        valid = mapped & scores.notna()
+
+        # Validate range
+        in_range = scores.between(0, 100)
+        for iso3, score in zip(iso3s[valid & ~in_range], scores[valid & ~in_range]):
+            self.stats["warnings"].append(
+                f"OECD score {float(score)} for {iso3} outside expected range"
+            )
 
-            # Get actual year from data if available
-            data_year = int(row[year_col]) if year_col else year
+        # Get actual year from data if available
+        keep = valid & in_range
+        data_years = (
+            df.loc[keep, year_col].astype(int).tolist()
+            if year_col
+            else [year] * int(keep.sum())
+        )
 
+        for iso3, data_year, score in zip(iso3s[keep], data_years, scores[keep]):
             observations.append(
                 Observation(
                     iso3=iso3,
-                    year=data_year,
+                    year=int(data_year),
                     source="OECD",
                     trust_type="institutional",
-                    raw_value=score,
+                    raw_value=float(score),
                     raw_unit="Percent high/moderately high trust",
-                    score_0_100=score,
+                    score_0_100=float(score),
                     sample_n=None,
                     method_notes=f"OECD Trust in Government Survey {data_year}",
                     source_url="https://data-explorer.oecd.org/",
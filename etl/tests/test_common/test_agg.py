@@ -0,0 +1,127 @@
+"""Tests for grouped aggregation kernels."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.agg import binary_trust_counts, response_codes, scale_trust_counts
+
+
+class TestResponseCodes:
+    """Tests for response_codes."""
+
+    def test_codes(self):
+        codes = response_codes(pd.Series([1.0, 7.0, -2.0, np.nan, 2.5]))
+
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [1, 7, -2, -1, -1]
+
+    def test_large_codes_clipped(self):
+        codes = response_codes(pd.Series([888888, -888888, 98]))
+
+        assert codes.tolist() == [127, -128, 98]
+
+    def test_non_numeric(self):
+        assert response_codes(pd.Series(["3", "n/a"])).tolist() == [3, -1]
+
+
+class TestBinaryTrustCounts:
+    """Tests for binary_trust_counts."""
+
+    def test_counts_per_group(self):
+        codes = np.array([1, 2, 1, 2, 2, 1])
+        group_ids = np.array([0, 0, 0, 1, 1, 2])
+
+        n_trust, n_valid = binary_trust_counts(codes, group_ids, 3)
+
+        assert n_trust.tolist() == [2, 0, 1]
+        assert n_valid.tolist() == [3, 2, 1]
+
+    def test_invalid_codes_skipped(self):
+        codes = np.array([1, 3, -1, np.nan, 2])
+        group_ids = np.zeros(5, dtype=np.int64)
+
+        n_trust, n_valid = binary_trust_counts(codes, group_ids, 1)
+
+        assert n_trust.tolist() == [1]
+        assert n_valid.tolist() == [2]
+
+    def test_rows_without_group(self):
+        codes = np.array([1, 1, 2])
+        group_ids = np.array([-1, 1, -1])
+
+        n_trust, n_valid = binary_trust_counts(codes, group_ids, 3)
+
+        assert n_trust.tolist() == [0, 1, 0]
+        assert n_valid.tolist() == [0, 1, 0]
+
+    def test_custom_codes(self):
+        codes = np.array([1, 0, 0])
+        group_ids = np.array([0, 0, 0])
+
+        n_trust, n_valid = binary_trust_counts(
+            codes, group_ids, 1, trust_code=1, distrust_code=0
+        )
+
+        assert n_trust.tolist() == [1]
+        assert n_valid.tolist() == [3]
+
+
+class TestScaleTrustCounts:
+    """Tests for scale_trust_counts."""
+
+    def test_counts_per_group(self):
+        codes = np.array([1, 2, 3, 4, 4, 2])
+        group_ids = np.array([0, 0, 0, 1, 1, 1])
+
+        n_trust, n_valid = scale_trust_counts(codes, group_ids, 2, (1, 4), (1, 2))
+
+        assert n_trust.tolist() == [2, 1]
+        assert n_valid.tolist() == [3, 3]
+
+    def test_invalid_codes_skipped(self):
+        codes = np.array([7, 5, 1, 8, -1, np.nan, 988888])
+        group_ids = np.zeros(7, dtype=np.int64)
+
+        n_trust, n_valid = scale_trust_counts(codes, group_ids, 1, (1, 7), (5, 7))
+
+        assert n_trust.tolist() == [2]
+        assert n_valid.tolist() == [3]
+
+    def test_rows_without_group(self):
+        codes = np.array([1, 1, 2])
+        group_ids = np.array([-1, 1, -1])
+
+        n_trust, n_valid = scale_trust_counts(codes, group_ids, 2, (1, 4), (1, 2))
+
+        assert n_trust.tolist() == [0, 1]
+        assert n_valid.tolist() == [0, 1]
+
+    def test_several_questions(self):
+        codes = np.array([[7, 1], [5, np.nan], [2, 6]])
+        group_ids = np.array([0, 1, 1])
+
+        n_trust, n_valid = scale_trust_counts(codes, group_ids, 2, (1, 7), (5, 7))
+
+        assert n_trust.tolist() == [[1, 0], [1, 1]]
+        assert n_valid.tolist() == [[1, 1], [2, 1]]
+
+    def test_int8_codes(self):
+        codes = np.array([[7, 1], [5, -1], [2, 6], [127, 5]], dtype=np.int8)
+        group_ids = np.array([0, 1, 1, -1])
+
+        n_trust, n_valid = scale_trust_counts(codes, group_ids, 2, (1, 7), (5, 7))
+
+        assert n_trust.tolist() == [[1, 0], [1, 1]]
+        assert n_valid.tolist() == [[1, 1], [2, 1]]
+
+        n_trust, n_valid = scale_trust_counts(codes[:, 0], group_ids, 2, (1, 7), (5, 7))
+
+        assert n_trust.tolist() == [1, 1]
+        assert n_valid.tolist() == [1, 2]
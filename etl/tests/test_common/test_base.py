@@ -0,0 +1,69 @@
+"""Tests for base processor helpers."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.base import OBSERVATION_COLUMNS, Observation, observations_from_frame
+
+
+def _row(**overrides):
+    row = {
+        "iso3": "SWE",
+        "year": 2023,
+        "source": "TEST",
+        "trust_type": "interpersonal",
+        "raw_value": 63.2,
+        "raw_unit": "percent",
+        "score_0_100": 63.2,
+        "sample_n": 1200,
+        "method_notes": "notes",
+        "source_url": "https://example.org",
+        "methodology": "binary",
+    }
+    row.update(overrides)
+    return row
+
+
+class TestObservationsFromFrame:
+    """Tests for building Observations from a DataFrame."""
+
+    def test_columns_match_observation_fields(self):
+        assert OBSERVATION_COLUMNS[0] == "iso3"
+        assert OBSERVATION_COLUMNS[-1] == "methodology"
+        assert len(OBSERVATION_COLUMNS) == len(Observation.__dataclass_fields__)
+
+    def test_round_trip(self):
+        df = pd.DataFrame([_row(), _row(iso3="NOR", year=2022)])
+        observations = observations_from_frame(df)
+        assert observations == [
+            Observation(**_row()),
+            Observation(**_row(iso3="NOR", year=2022)),
+        ]
+
+    def test_native_python_types(self):
+        obs = observations_from_frame(pd.DataFrame([_row()]))[0]
+        assert type(obs.year) is int
+        assert type(obs.sample_n) is int
+        assert type(obs.score_0_100) is float
+
+    def test_missing_column_becomes_none(self):
+        row = _row()
+        del row["methodology"]
+        obs = observations_from_frame(pd.DataFrame([row]))[0]
+        assert obs.methodology is None
+
+    def test_nan_becomes_none(self):
+        df = pd.DataFrame([_row(sample_n=None), _row(sample_n=800)])
+        observations = observations_from_frame(df)
+        assert observations[0].sample_n is None
+        assert observations[1].sample_n == 800
+        assert type(observations[1].sample_n) is int
+
+    def test_empty_frame(self):
+        assert observations_from_frame(pd.DataFrame()) == []
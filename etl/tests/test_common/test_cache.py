@@ -0,0 +1,195 @@
+"""Tests for the parsed-data cache."""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from common import cache
+from common.cache import (
+    cache_chunks,
+    default_cache_path,
+    load_cached,
+    read_cached,
+    write_cache,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A raw CSV source file."""
+    path = tmp_path / "survey.csv"
+    pd.DataFrame({"country": ["SWE", "NOR"], "trust": [6.1, 6.8]}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+class CountingLoader:
+    """Loader that records how often the source is parsed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return pd.read_csv(self.path)
+
+
+class TestDefaultCachePath:
+    """Tests for cache path naming."""
+
+    def test_sibling_file(self):
+        assert default_cache_path(Path("/data/ess/ESS10.csv")) == Path(
+            "/data/ess/ESS10.csv.parquet"
+        )
+
+
+class TestReadCached:
+    """Tests for reading through the Parquet cache."""
+
+    def test_reuses_cache(self, source):
+        pytest.importorskip("pyarrow")
+        loader = CountingLoader(source)
+
+        first = read_cached(source, loader)
+        second = read_cached(source, loader)
+
+        assert loader.calls == 1
+        assert default_cache_path(source).exists()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_column_subset(self, source):
+        pytest.importorskip("pyarrow")
+        loader = CountingLoader(source)
+
+        read_cached(source, loader)
+        df = read_cached(source, loader, columns=["trust"])
+
+        assert loader.calls == 1
+        assert df.columns.tolist() == ["trust"]
+
+    def test_missing_column_reloads(self, source):
+        pytest.importorskip("pyarrow")
+        loader = CountingLoader(source)
+
+        read_cached(source, lambda: loader()[["country"]])
+        df = read_cached(source, loader, columns=["country", "trust"])
+
+        assert loader.calls == 2
+        assert df.columns.tolist() == ["country", "trust"]
+
+    def test_projected_cache_not_used_for_all_columns(self, source):
+        pytest.importorskip("pyarrow")
+        loader = CountingLoader(source)
+
+        read_cached(source, lambda: loader()[["country"]], columns=["country"])
+        df = read_cached(source, loader)
+
+        assert loader.calls == 2
+        assert df.columns.tolist() == ["country", "trust"]
+
+    def test_stale_cache_reloads(self, source):
+        pytest.importorskip("pyarrow")
+        loader = CountingLoader(source)
+
+        read_cached(source, loader)
+        cache_mtime = default_cache_path(source).stat().st_mtime
+        os.utime(source, (cache_mtime + 10, cache_mtime + 10))
+        read_cached(source, loader)
+
+        assert loader.calls == 2
+
+    def test_without_pyarrow(self, source, monkeypatch):
+        monkeypatch.setattr(cache, "parquet_available", lambda: False)
+        loader = CountingLoader(source)
+
+        read_cached(source, loader)
+        read_cached(source, loader)
+
+        assert loader.calls == 2
+        assert not default_cache_path(source).exists()
+
+
+class TestLoadAndWriteCache:
+    """Tests for the lower-level cache helpers used by streaming readers."""
+
+    def test_no_cache(self, source):
+        assert load_cached(source) is None
+
+    def test_round_trip(self, source):
+        pytest.importorskip("pyarrow")
+        df = pd.read_csv(source)
+
+        write_cache(source, df)
+
+        pd.testing.assert_frame_equal(
+            load_cached(source, columns=["trust"]), df[["trust"]]
+        )
+
+    def test_missing_column(self, source):
+        pytest.importorskip("pyarrow")
+        write_cache(source, pd.read_csv(source)[["country"]])
+
+        assert load_cached(source, columns=["country", "trust"]) is None
+
+    def test_all_columns_need_complete_cache(self, source):
+        pytest.importorskip("pyarrow")
+        df = pd.read_csv(source)
+
+        write_cache(source, df)
+        assert load_cached(source) is None
+
+        write_cache(source, df, complete=True)
+        pd.testing.assert_frame_equal(load_cached(source), df)
+
+
+class TestCacheChunks:
+    """Tests for caching a chunked read as it is consumed."""
+
+    def test_round_trip(self, source):
+        pytest.importorskip("pyarrow")
+        chunks = list(pd.read_csv(source, chunksize=1))
+
+        passed = list(cache_chunks(source, chunks))
+
+        assert passed == chunks
+        pd.testing.assert_frame_equal(
+            load_cached(source, columns=["country", "trust"]), pd.read_csv(source)
+        )
+
+    def test_interrupted_read(self, source):
+        pytest.importorskip("pyarrow")
+        chunks = cache_chunks(source, pd.read_csv(source, chunksize=1))
+
+        next(chunks)
+        chunks.close()
+
+        assert load_cached(source, columns=["country", "trust"]) is None
+        assert list(source.parent.iterdir()) == [source]
+
+    def test_mismatched_chunk(self, source):
+        pytest.importorskip("pyarrow")
+        chunks = [
+            pd.DataFrame({"country": ["SWE"], "trust": [6.1]}),
+            pd.DataFrame({"country": ["NOR"], "trust": ["high"]}),
+        ]
+
+        passed = list(cache_chunks(source, chunks))
+
+        assert passed == chunks
+        assert load_cached(source, columns=["country", "trust"]) is None
+
+    def test_without_pyarrow(self, source, monkeypatch):
+        monkeypatch.setattr(cache, "parquet_available", lambda: False)
+        chunks = list(pd.read_csv(source, chunksize=1))
+
+        assert list(cache_chunks(source, chunks)) == chunks
+        assert not default_cache_path(source).exists()
@@ -0,0 +1,97 @@
+"""Tests for raw data readers."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.readers import read_csv, read_excel
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    """A small survey CSV with a missing value."""
+    path = tmp_path / "survey.csv"
+    path.write_text("cntry,ppltrst,idno\nSE,7,1\nNO,,2\n")
+    return path
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def engine(request, monkeypatch):
+    """Run each test with and without pyarrow available."""
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setitem(sys.modules, "pyarrow.csv", None)
+    return request.param
+
+
+class TestReadCsv:
+    """Tests for read_csv."""
+
+    def test_all_columns(self, survey_csv, engine):
+        df = read_csv(survey_csv)
+        assert df.columns.tolist() == ["cntry", "ppltrst", "idno"]
+        assert df["ppltrst"].isna().tolist() == [False, True]
+
+    def test_column_subset_in_file_order(self, survey_csv, engine):
+        df = read_csv(survey_csv, columns=["ppltrst", "cntry"])
+        assert df.columns.tolist() == ["cntry", "ppltrst"]
+        assert len(df) == 2
+
+    def test_missing_columns_ignored(self, survey_csv, engine):
+        df = read_csv(survey_csv, columns=["ppltrst", "trstprl"])
+        assert df.columns.tolist() == ["ppltrst"]
+
+    def test_no_matching_columns(self, survey_csv, engine):
+        df = read_csv(survey_csv, columns=["trstprl"])
+        assert df.columns.tolist() == []
+
+    def test_numeric_values(self, survey_csv, engine):
+        df = read_csv(survey_csv, columns=["ppltrst"])
+        assert df["ppltrst"].tolist()[0] == 7
+        assert pd.api.types.is_float_dtype(df["ppltrst"])
+
+
+@pytest.fixture
+def survey_xlsx(tmp_path):
+    """A small workbook with a title row above the header."""
+    path = tmp_path / "survey.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame([["Scores"]]).to_excel(
+            writer, sheet_name="data", index=False, header=False
+        )
+        pd.DataFrame({"country": ["SWE", "NOR"], "total": [100, 98]}).to_excel(
+            writer, sheet_name="data", index=False, startrow=1
+        )
+    return path
+
+
+@pytest.fixture(params=["calamine", "openpyxl"])
+def excel_engine(request, monkeypatch):
+    """Run each test with and without python-calamine available."""
+    if request.param == "calamine":
+        pytest.importorskip("python_calamine")
+    else:
+        monkeypatch.setitem(sys.modules, "python_calamine", None)
+    return request.param
+
+
+class TestReadExcel:
+    """Tests for read_excel."""
+
+    def test_header_row(self, survey_xlsx, excel_engine):
+        df = read_excel(survey_xlsx, sheet_name="data", header=1)
+        assert df.columns.tolist() == ["country", "total"]
+        assert df["total"].tolist() == [100, 98]
+
+    def test_missing_columns_ignored(self, survey_xlsx, excel_engine):
+        df = read_excel(
+            survey_xlsx, sheet_name="data", header=1, columns=["total", "status"]
+        )
+        assert df.columns.tolist() == ["total"]
@@ -0,0 +1 @@
+"""Tests for ETL jobs."""
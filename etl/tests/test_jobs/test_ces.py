@@ -0,0 +1,41 @@
+"""Tests for the CES job."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+# jobs/ is a script directory, not a package
+sys.path.insert(0, str(project_root / "etl" / "jobs"))
+
+from ces import CESProcessor
+
+
+@pytest.fixture
+def processor():
+    """A CES processor without data directories.
+
+    process() needs no processor state, so BaseProcessor.__init__ (which
+    creates the raw and staging directories) is skipped.
+    """
+    return object.__new__(CESProcessor)
+
+
+class TestProcess:
+    """Tests for processing CES wave files."""
+
+    def test_badly_encoded_stata_file(self, processor, tmp_path):
+        pytest.importorskip("pyreadstat")
+        dta_path = tmp_path / "CES2015_Combined_Stata14.dta"
+        pd.DataFrame({"p_trust": ["trustXX"], "sat_govt": [1.0]}).to_stata(
+            dta_path, write_index=False, version=118
+        )
+        # Stata 118 strings are UTF-8; corrupt one so it no longer decodes
+        dta_path.write_bytes(dta_path.read_bytes().replace(b"XX", b"\xff\xfe"))
+
+        with pytest.raises(RuntimeError, match="encoding issues"):
+            processor.process(dta_path, 2015)
@@ -0,0 +1,56 @@
+"""Tests for the EVS job."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+# jobs/ is a script directory, not a package
+sys.path.insert(0, str(project_root / "etl" / "jobs"))
+
+from evs import EVSProcessor
+
+
+@pytest.fixture
+def processor():
+    """An EVS processor without data directories.
+
+    _convert_to_csv() needs no processor state, so BaseProcessor.__init__
+    (which creates the raw and staging directories) is skipped.
+    """
+    return object.__new__(EVSProcessor)
+
+
+class TestConvertToCsv:
+    """Tests for converting SPSS/Stata files to CSV."""
+
+    def test_sav_columns_out_of_order(self, processor, tmp_path):
+        pyreadstat = pytest.importorskip("pyreadstat")
+        sav_path = tmp_path / "evs.sav"
+        # Trust before year before country, unlike the order processing reads
+        pyreadstat.write_sav(
+            pd.DataFrame(
+                {"A165": [1.0, 2.0], "S020": [2008.0, 2017.0], "S003": [752.0, 578.0]}
+            ),
+            str(sav_path),
+        )
+
+        df = pd.read_csv(processor._convert_to_csv(sav_path))
+
+        assert df.columns.tolist() == ["S003", "S020", "A165"]
+        assert df.values.tolist() == [[752.0, 2008.0, 1.0], [578.0, 2017.0, 2.0]]
+
+    def test_dta(self, processor, tmp_path):
+        dta_path = tmp_path / "evs.dta"
+        pd.DataFrame(
+            {"A165": [1.0, 2.0], "S020": [2008.0, 2017.0], "S003": [752.0, 578.0]}
+        ).to_stata(dta_path, write_index=False)
+
+        df = pd.read_csv(processor._convert_to_csv(dta_path))
+
+        assert df.columns.tolist() == ["S003", "S020", "A165"]
+        assert df.values.tolist() == [[752.0, 2008.0, 1.0], [578.0, 2017.0, 2.0]]